@@ -17,6 +17,8 @@ const state = {
   dateTo: null,
   lastFile: null,
   allReports: [],
+  totals: null,
+  liveUpdates: false,
   currentPage: 1,
   pageSize: 10,
 };
@@ -152,8 +154,10 @@ async function handleFile(file) {
       throw new Error(error || "Не удалось загрузить файл");
     }
     
-    // Reload history to show the new report
-    await loadHistory();
+    // Live updates patch the history on their own; otherwise reload it
+    if (!state.liveUpdates) {
+      await loadHistory();
+    }
   } catch (err) {
     console.error(err);
     alert(`Ошибка загрузки: ${err.message}`);
@@ -203,6 +207,7 @@ async function loadHistory() {
     
     // Render totals from server (already filtered)
     if (data.totals) {
+      state.totals = data.totals;
       renderHistoryTotals(data.totals);
     }
     
@@ -221,6 +226,103 @@ function filterHistory() {
   loadHistory();
 }
 
+function matchesHistoryFilters(file) {
+  // Mirrors the server-side filters of /reports
+  if (state.reportTypeFilters.size > 0 && state.reportTypeFilters.size < 2) {
+    const type = file.report_type || "";
+    const matchesType = [...state.reportTypeFilters].some((t) => type.includes(t));
+    if (!matchesType) return false;
+  }
+
+  if (state.severityFilters.size > 0 && state.severityFilters.size < severityOrder.length) {
+    const matchesSeverity = [...state.severityFilters].some(
+      (level) => (file.severity?.[level] || 0) > 0
+    );
+    if (!matchesSeverity) return false;
+  }
+
+  // Server compares UTC dates of created_at
+  const day = new Date(file.created * 1000).toISOString().slice(0, 10);
+  if (state.dateFrom && day < state.dateFrom) return false;
+  if (state.dateTo && day > state.dateTo) return false;
+
+  const query = searchInput.value.trim().toLowerCase();
+  if (query) {
+    const haystack = [file.name, file.git?.tag, file.git?.branch, file.git?.commit]
+      .filter(Boolean)
+      .join(" ")
+      .toLowerCase();
+    if (!haystack.includes(query)) return false;
+  }
+
+  return true;
+}
+
+function adjustHistoryTotals(file, sign) {
+  if (!state.totals) return;
+  const totals = state.totals;
+  totals.total_reports += sign;
+  totals.total_findings += sign * (file.total_findings || 0);
+  totals.total_files += sign * (file.total_files || 0);
+  totals.total_rules += sign * (file.total_rules || 0);
+  severityOrder.forEach((level) => {
+    totals.severity[level] += sign * (file.severity?.[level] || 0);
+  });
+  renderHistoryTotals(totals);
+}
+
+function applyReportAdded(file) {
+  if (state.allReports.some((report) => report.id === file.id)) return;
+  if (!matchesHistoryFilters(file)) return;
+  state.allReports.unshift(file);
+  adjustHistoryTotals(file, 1);
+  renderHistory(state.allReports);
+}
+
+function applyReportDeleted(event) {
+  const index = state.allReports.findIndex((report) => report.id === event.id);
+  if (index === -1) return;
+  const [file] = state.allReports.splice(index, 1);
+  adjustHistoryTotals(file, -1);
+
+  const totalPages = Math.max(1, Math.ceil(state.allReports.length / state.pageSize));
+  state.currentPage = Math.min(state.currentPage, totalPages);
+  renderHistory(state.allReports);
+}
+
+function setupLiveUpdates() {
+  if (!window.EventSource) {
+    loadHistory();
+    return;
+  }
+
+  const source = new EventSource("/events");
+  let wasConnected = false;
+  let loadedWithoutStream = false;
+
+  source.addEventListener("open", () => {
+    // (Re)load the list only once subscribed, so no event falls between
+    // the /reports snapshot and the stream, on the first connect or after a drop
+    loadHistory();
+    wasConnected = true;
+    state.liveUpdates = true;
+  });
+  source.addEventListener("error", () => {
+    // Without a stream yet, show the list anyway; open will resync it later
+    if (!wasConnected && !loadedWithoutStream) {
+      loadedWithoutStream = true;
+      loadHistory();
+    }
+    state.liveUpdates = false;
+  });
+  source.addEventListener("report_added", (event) => {
+    applyReportAdded(JSON.parse(event.data));
+  });
+  source.addEventListener("report_deleted", (event) => {
+    applyReportDeleted(JSON.parse(event.data));
+  });
+}
+
 function downloadPdf() {
   if (!state.filtered.length && !state.issues.length) {
     alert("Сначала загрузите отчёт");
@@ -323,7 +425,9 @@ function renderHistory(files) {
         alert("Не удалось удалить отчёт");
         return;
       }
-      await loadHistory();
+      if (!state.liveUpdates) {
+        await loadHistory();
+      }
     });
 
     item.append(info, openBtn, deleteBtn);
@@ -868,8 +972,9 @@ function init() {
   renderSeverityBar();
   renderIssues();
 
-  // Load history on page load since it's the default view
-  loadHistory();
+  // Load history on page load since it's the default view; it is fetched
+  // once the live updates stream is open
+  setupLiveUpdates();
 
   // Handle initial route
   handleRoute();
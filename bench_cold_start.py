@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Cold start benchmark for server.py.
+
+Spawns the server repeatedly on a free port with a temporary DB_PATH and
+UPLOAD_DIR and reports the median time from process start to the first
+successful /healthz and to the first /reports response, for a fresh data
+directory and for one with an already migrated database:
+
+    python bench_cold_start.py
+    python bench_cold_start.py --runs 20
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parent
+POLL_INTERVAL_SECONDS = 0.002
+START_TIMEOUT_SECONDS = 10
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="Server starts per scenario (default: 10)")
+    return parser.parse_args()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(url, deadline):
+    """Poll url until it answers 200, return the moment it did"""
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                response.read()
+                if response.status == 200:
+                    return time.perf_counter()
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(POLL_INTERVAL_SECONDS)
+    raise TimeoutError(f"{url} did not answer within {START_TIMEOUT_SECONDS}s")
+
+
+def measure_start(data_dir):
+    """Start the server once, return (ms to /healthz, ms to /reports)"""
+    port = free_port()
+    env = dict(
+        os.environ,
+        PORT=str(port),
+        DB_PATH=str(data_dir / "reports.db"),
+        UPLOAD_DIR=str(data_dir / "uploads"),
+    )
+    env.pop("DATABASE_URL", None)
+    env.pop("BLOB_STORAGE_URL", None)
+
+    base_url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        # Same command as the Docker image: -m reuses the cached bytecode of server.py
+        [sys.executable, "-m", "server"], cwd=SERVER_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = started + START_TIMEOUT_SECONDS
+        healthy = wait_for(f"{base_url}/healthz", deadline)
+        listed = wait_for(f"{base_url}/reports", deadline)
+    finally:
+        process.terminate()
+        process.wait()
+    return (healthy - started) * 1000, (listed - started) * 1000
+
+
+def run_scenario(name, runs, reuse_data_dir):
+    healthz, reports = [], []
+    with tempfile.TemporaryDirectory() as shared_dir:
+        if reuse_data_dir:
+            # First start creates and migrates the database, measured runs reuse it
+            measure_start(Path(shared_dir))
+        for _ in range(runs):
+            if reuse_data_dir:
+                timings = measure_start(Path(shared_dir))
+            else:
+                with tempfile.TemporaryDirectory() as fresh_dir:
+                    timings = measure_start(Path(fresh_dir))
+            healthz.append(timings[0])
+            reports.append(timings[1])
+    print(
+        f"{name:<12} /healthz median {statistics.median(healthz):7.1f} ms"
+        f"   /reports median {statistics.median(reports):7.1f} ms"
+        f"   (min {min(reports):.1f}, max {max(reports):.1f}, {runs} runs)"
+    )
+
+
+def main():
+    args = parse_args()
+    run_scenario("fresh DB", args.runs, reuse_data_dir=False)
+    run_scenario("current DB", args.runs, reuse_data_dir=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,82 +1,515 @@
+import csv
+import hashlib
+import importlib
+import importlib.util
+import io
 import json
+import mimetypes
 import os
+import re
+import select
+import selectors
 import sqlite3
+import threading
 import time
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+import zlib
+from collections import Counter
+from itertools import chain
+from contextlib import closing
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
 from pathlib import Path
 from urllib.parse import urlparse, parse_qs
-import cgi
 from datetime import datetime
 
 BASE_DIR = Path(__file__).resolve().parent
-UPLOAD_DIR = BASE_DIR / "uploads"
-UPLOAD_DIR.mkdir(exist_ok=True)
-DB_PATH = BASE_DIR / "reports.db"
+UPLOAD_DIR = Path(os.environ.get("UPLOAD_DIR", BASE_DIR / "uploads"))
+DB_PATH = Path(os.environ.get("DB_PATH", BASE_DIR / "reports.db"))
+# Read-only copy of the SQLite database that analytic queries read from
+SNAPSHOT_PATH = Path(os.environ.get("SNAPSHOT_PATH", DB_PATH.with_name(f"{DB_PATH.stem}.snapshot.db")))
+# How often the snapshot is refreshed, i.e. how stale analytic results may get; 0 disables it
+SNAPSHOT_REFRESH_SECONDS = float(os.environ.get("SNAPSHOT_REFRESH_SECONDS", "0"))
+
+# postgresql://... selects the shared PostgreSQL backend, otherwise SQLite at DB_PATH
+DATABASE_URL = os.environ.get("DATABASE_URL", "")
+# s3://bucket/prefix selects S3-compatible blob storage, otherwise files in UPLOAD_DIR
+BLOB_STORAGE_URL = os.environ.get("BLOB_STORAGE_URL", "")
+# Custom endpoint for S3-compatible services such as MinIO
+S3_ENDPOINT_URL = os.environ.get("S3_ENDPOINT_URL") or None
+# Upper bound of pooled PostgreSQL connections per replica
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "20"))
+# How long a request waits for a pooled PostgreSQL connection before a 503
+DB_POOL_WAIT_SECONDS = float(os.environ.get("DB_POOL_WAIT_SECONDS", "5"))
+# PostgreSQL channel used to fan report events out to every replica
+PG_EVENTS_CHANNEL = "reader_report_events"
+# Advisory lock key that serializes schema migrations across replicas
+PG_MIGRATION_LOCK_ID = 7_205_114
 
 DEFAULT_PORT = int(os.environ.get("PORT", "8000"))
 
+# Rows are flushed to the client in chunks of roughly this size
+STREAM_CHUNK_SIZE = 64 * 1024
+# Rows fetched from the database cursor per round trip
+FETCH_BATCH_SIZE = 500
+
+# Columns selected for report listings; rows are addressed by position
+REPORT_COLUMNS = (
+    "id", "filename", "stored_filename", "file_path",
+    "report_type", "total_findings", "total_files", "total_rules",
+    "severity_critical", "severity_high", "severity_medium",
+    "severity_low", "severity_info",
+    "git_tag", "git_commit", "git_branch",
+    "gitlab_pipeline_id", "gitlab_job_id",
+    "gitlab_project", "gitlab_project_url",
+    "created_at",
+)
+COL = {name: index for index, name in enumerate(REPORT_COLUMNS)}
+# Columns written by /export/reports, in order
+EXPORT_REPORT_FIELDS = tuple(name for name in REPORT_COLUMNS if name != "file_path")
+# Columns written by /export/hotspots, in order
+EXPORT_HOTSPOT_FIELDS = (
+    "report_id", "created_at", "gitlab_project", "git_branch", "git_commit",
+    "kind", "name", "findings",
+)
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+# Admission control: uploads above MAX_UPLOAD_BYTES are refused outright;
+# ingest and read traffic get separate bounded lanes so a burst of uploads
+# cannot starve /reports readers
+MAX_INFLIGHT_UPLOAD_BYTES = int(os.environ.get("MAX_INFLIGHT_UPLOAD_BYTES", str(200 * 1024 * 1024)))
+# A single upload larger than the whole in-flight budget could never be
+# admitted and would get 429 forever, so it is capped and refused with 413
+MAX_UPLOAD_BYTES = min(
+    int(os.environ.get("MAX_UPLOAD_BYTES", str(50 * 1024 * 1024))),
+    MAX_INFLIGHT_UPLOAD_BYTES,
+)
+INGEST_CONCURRENCY = int(os.environ.get("INGEST_CONCURRENCY", "4"))
+READ_CONCURRENCY = int(os.environ.get("READ_CONCURRENCY", "32"))
+# How long a request may wait for a free lane before it is rejected
+ADMISSION_WAIT_SECONDS = float(os.environ.get("ADMISSION_WAIT_SECONDS", "0.5"))
+# Value of Retry-After sent with 429/503 responses
+RETRY_AFTER_SECONDS = int(os.environ.get("RETRY_AFTER_SECONDS", "5"))
+# Idle keep-alive connections and stalled request bodies are dropped after this
+REQUEST_TIMEOUT_SECONDS = float(os.environ.get("REQUEST_TIMEOUT_SECONDS", "60"))
+# Overall deadline for receiving one upload body, however steadily it trickles in
+UPLOAD_TIMEOUT_SECONDS = float(os.environ.get("UPLOAD_TIMEOUT_SECONDS", "300"))
+# Upload bodies are read from the socket in pieces of at most this size
+UPLOAD_READ_CHUNK_SIZE = 64 * 1024
+# GET endpoints that go through the read lane
+READ_LANE_PATHS = ("/reports", "/stats/top-rules", "/stats/top-files", "/export/reports", "/export/hotspots")
+READ_LANE_PREFIXES = ("/uploads/", "/reports/by-hash/")
+
+# Upload fields that /reports/by-hash/ can additionally match on, so the
+# same file produced by another pipeline does not count as already uploaded
+HASH_MATCH_FIELDS = ("gitlab_project", "git_commit", "gitlab_pipeline_id")
+
+# Default and maximum number of entries returned by /stats/top-*
+TOP_DEFAULT_LIMIT = 10
+TOP_MAX_LIMIT = 100
+
+# Idle SSE connections get a comment line this often to detect dead peers
+SSE_HEARTBEAT_SECONDS = 15
+# Subscribers whose unsent backlog grows beyond this are dropped
+SSE_MAX_BACKLOG = 256 * 1024
+
+# Responses smaller than this are not worth compressing
+COMPRESS_MIN_SIZE = 1024
+# Frontend files served from memory, compressed on first request
+STATIC_ASSETS = ("index.html", "app.js", "styles.css")
+
+# Optional faster serializer backend, used when installed locally
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional backends for multi-node deployments; imported on first use
+# rather than at startup, as they noticeably slow it down
+psycopg2 = None
+
+
+def load_psycopg2():
+    global psycopg2
+    if psycopg2 is None:
+        importlib.import_module("psycopg2.extras")
+        importlib.import_module("psycopg2.pool")
+        psycopg2 = importlib.import_module("psycopg2")
+    return psycopg2
+
+# Optional brotli support; gzip is always available
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def dumps_json(payload):
+    """Serialize payload to UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
 
 class ReportDB:
-    def __init__(self, db_path):
+    def __init__(self, db_path, snapshot_path=None):
         self.db_path = db_path
-        self.init_db()
+        self.listeners = []
+        # The schema is checked on first use rather than at import time
+        self.schema_ready = False
+        self.schema_lock = threading.Lock()
+        # Analytic reads go to the snapshot once the first refresh has finished
+        self.snapshot_path = snapshot_path
+        self.snapshot_taken_at = None
+        self.snapshot_thread = None
+        # Long-lived connection of the refresh thread; PRAGMA data_version
+        # on it changes whenever another connection commits
+        self.snapshot_watch = None
+        self.snapshot_version = None
+
+    def add_listener(self, callback):
+        """Register callback(event, row) for report changes
+
+        row is a tuple ordered like REPORT_COLUMNS. Events are
+        "report_added" and "report_deleted".
+        """
+        self.listeners.append(callback)
+
+    def notify(self, event, row):
+        for callback in self.listeners:
+            try:
+                callback(event, row)
+            except Exception as e:
+                # A broken subscriber must never fail the write itself
+                print(f"Report listener failed on {event}: {e}")
 
-    def get_connection(self):
+    def enqueue_event(self, conn, event, row):
+        """Hook called inside the write transaction that produced the event"""
+
+    def after_commit(self, event, row):
+        """Deliver an event once its write is committed; never raises"""
+        self.notify(event, row)
+
+    def fetch_report_row(self, conn, where, params):
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(f"SELECT {', '.join(REPORT_COLUMNS)} FROM reports WHERE {where}", params)
+        return cursor.fetchone()
+
+    def connect(self):
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
+    def get_connection(self, analytic=False):
+        """Open a connection to the primary database
+
+        With analytic=True the read-only snapshot is used instead when one
+        is available; such connections must not be written to.
+        """
+        if not self.schema_ready:
+            self.init_db()
+        if analytic and self.snapshot_taken_at is not None:
+            return self.connect_snapshot()
+        return self.connect()
+
+    def connect_snapshot(self):
+        # The snapshot file is never modified in place, only replaced, so
+        # immutable=1 lets SQLite skip locking it altogether
+        conn = sqlite3.connect(f"{Path(self.snapshot_path).resolve().as_uri()}?immutable=1", uri=True)
+        conn.row_factory = sqlite3.Row
+        return conn
+
     def init_db(self):
-        conn = self.get_connection()
+        """Bring the schema up to date; a no-op once it is current"""
+        with self.schema_lock:
+            if self.schema_ready:
+                return
+            conn = self.connect()
+            try:
+                self.configure_database(conn)
+                self.migrate(conn)
+            finally:
+                conn.close()
+            self.schema_ready = True
+
+    def configure_database(self, conn):
+        # WAL lets readers run alongside writers: /reports keeps its cursor
+        # open while rows go out to the client, and the snapshot copy reads
+        # the whole database, neither of which may block uploads
+        conn.execute("PRAGMA journal_mode=WAL")
+
+    def start(self):
+        """Start background work; called by run(), never at import time"""
+        if self.snapshot_path is not None:
+            self.start_snapshots(SNAPSHOT_REFRESH_SECONDS)
+
+    def start_snapshots(self, interval):
+        """Refresh the read snapshot every interval seconds in a background thread"""
+        if self.snapshot_thread is None:
+            self.snapshot_thread = threading.Thread(
+                target=self.refresh_snapshots, args=(interval,), name="snapshot-refresh", daemon=True
+            )
+            self.snapshot_thread.start()
+
+    def refresh_snapshots(self, interval):
+        while True:
+            started = time.monotonic()
+            try:
+                self.refresh_snapshot()
+            except Exception as e:
+                # Keep serving the previous snapshot; its age shows how stale it is
+                print(f"Snapshot refresh failed: {e}")
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+    def refresh_snapshot(self):
+        """Copy the primary database into a new snapshot file and swap it in
+
+        The online backup reads one consistent version of the primary, and
+        the temporary copy replaces the snapshot atomically, so connections
+        still reading the previous snapshot are not disturbed.
+        """
+        if not self.schema_ready:
+            self.init_db()
+        if self.snapshot_watch is None:
+            self.snapshot_watch = self.connect()
+        taken_at = time.time()
+        version = self.snapshot_watch.execute("PRAGMA data_version").fetchone()[0]
+        if version == self.snapshot_version:
+            # Nothing was committed since the last copy, so it is still current
+            self.snapshot_taken_at = taken_at
+            return
+
+        snapshot_path = Path(self.snapshot_path)
+        tmp_path = snapshot_path.with_name(f"{snapshot_path.name}.tmp")
+        with closing(self.connect()) as source, closing(sqlite3.connect(tmp_path)) as target:
+            source.backup(target)
+            # A rollback journal keeps the copy readable without -wal/-shm files
+            target.execute("PRAGMA journal_mode=DELETE")
+        os.replace(tmp_path, snapshot_path)
+        self.snapshot_version = version
+        self.snapshot_taken_at = taken_at
+
+    def snapshot_age(self):
+        """Seconds since the current snapshot was taken, or None without one"""
+        if self.snapshot_taken_at is None:
+            return None
+        return time.time() - self.snapshot_taken_at
+
+    @property
+    def migrations(self):
+        """Schema migrations; the schema version is the number applied so far"""
+        return [self.migrate_reports, self.migrate_hotspots, self.migrate_report_order]
+
+    def migrate(self, conn):
+        if self.get_schema_version(conn) >= len(self.migrations):
+            return
+
+        # Another process may be migrating too; re-check under the write lock
+        self.begin_migration(conn)
         try:
-            # Create table with all columns
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS reports (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    filename TEXT NOT NULL,
-                    stored_filename TEXT NOT NULL UNIQUE,
-                    file_path TEXT NOT NULL,
-                    report_type TEXT,
-                    total_findings INTEGER DEFAULT 0,
-                    total_files INTEGER DEFAULT 0,
-                    total_rules INTEGER DEFAULT 0,
-                    severity_critical INTEGER DEFAULT 0,
-                    severity_high INTEGER DEFAULT 0,
-                    severity_medium INTEGER DEFAULT 0,
-                    severity_low INTEGER DEFAULT 0,
-                    severity_info INTEGER DEFAULT 0,
-                    git_tag TEXT,
-                    git_commit TEXT,
-                    git_branch TEXT,
-                    gitlab_pipeline_id TEXT,
-                    gitlab_job_id TEXT,
-                    gitlab_project TEXT,
-                    gitlab_project_url TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
+            version = self.get_schema_version(conn)
+            for migration in self.migrations[version:]:
+                migration(conn)
+            self.set_schema_version(conn, len(self.migrations))
             conn.commit()
-            
-            # Add new columns to existing tables (for migration)
-            # SQLite doesn't support IF NOT EXISTS for ALTER TABLE, so we use try/except
-            new_columns = [
-                ("git_tag", "TEXT"),
-                ("git_commit", "TEXT"),
-                ("git_branch", "TEXT"),
-                ("gitlab_pipeline_id", "TEXT"),
-                ("gitlab_job_id", "TEXT"),
-                ("gitlab_project", "TEXT"),
-                ("gitlab_project_url", "TEXT"),
-            ]
-            
-            for column_name, column_type in new_columns:
+        except Exception:
+            conn.rollback()
+            raise
+
+    def get_schema_version(self, conn):
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def set_schema_version(self, conn, version):
+        conn.execute(f"PRAGMA user_version = {int(version)}")
+
+    def begin_migration(self, conn):
+        conn.execute("BEGIN IMMEDIATE")
+
+    def migrate_reports(self, conn):
+        """1: reports table, including columns added after its first release"""
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS reports (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                filename TEXT NOT NULL,
+                stored_filename TEXT NOT NULL UNIQUE,
+                file_path TEXT NOT NULL,
+                report_type TEXT,
+                total_findings INTEGER DEFAULT 0,
+                total_files INTEGER DEFAULT 0,
+                total_rules INTEGER DEFAULT 0,
+                severity_critical INTEGER DEFAULT 0,
+                severity_high INTEGER DEFAULT 0,
+                severity_medium INTEGER DEFAULT 0,
+                severity_low INTEGER DEFAULT 0,
+                severity_info INTEGER DEFAULT 0,
+                git_tag TEXT,
+                git_commit TEXT,
+                git_branch TEXT,
+                gitlab_pipeline_id TEXT,
+                gitlab_job_id TEXT,
+                gitlab_project TEXT,
+                gitlab_project_url TEXT,
+                content_sha256 TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # Databases created by older versions may lack some columns
+        existing = {row["name"] for row in conn.execute("PRAGMA table_info(reports)")}
+        new_columns = [
+            ("git_tag", "TEXT"),
+            ("git_commit", "TEXT"),
+            ("git_branch", "TEXT"),
+            ("gitlab_pipeline_id", "TEXT"),
+            ("gitlab_job_id", "TEXT"),
+            ("gitlab_project", "TEXT"),
+            ("gitlab_project_url", "TEXT"),
+            ("content_sha256", "TEXT"),
+        ]
+        for column_name, column_type in new_columns:
+            if column_name not in existing:
+                conn.execute(f"ALTER TABLE reports ADD COLUMN {column_name} {column_type}")
+
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_reports_content_sha256
+            ON reports (content_sha256)
+        """)
+
+    def migrate_hotspots(self, conn):
+        """2: per-report rule/path counts, kept so deletes can be reversed
+        exactly, and rolled-up counters used by the hotspot queries"""
+        backfill = not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'report_hotspots'"
+        ).fetchone()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS report_hotspots (
+                report_id INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                name TEXT NOT NULL,
+                findings INTEGER NOT NULL,
+                PRIMARY KEY (report_id, kind, name)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS hotspot_counters (
+                kind TEXT NOT NULL,
+                project TEXT NOT NULL,
+                day TEXT NOT NULL,
+                branch TEXT NOT NULL,
+                name TEXT NOT NULL,
+                findings INTEGER NOT NULL DEFAULT 0,
+                reports INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (kind, project, day, branch, name)
+            )
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_hotspot_counters_day
+            ON hotspot_counters (kind, day)
+        """)
+        if backfill:
+            self.backfill_hotspots(conn)
+
+    def migrate_report_order(self, conn):
+        """3: index behind the newest-first listing of /reports"""
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_reports_created_at
+            ON reports (created_at)
+        """)
+
+    def backfill_hotspots(self, conn):
+        """Fill hotspot counters for reports stored before they existed"""
+        rows = conn.execute("SELECT id, file_path FROM reports").fetchall()
+        for row in rows:
+            try:
+                with open(row["file_path"], "rb") as f:
+                    metadata = self.extract_metadata(json.loads(f.read().decode("utf-8")))
+            except (OSError, ValueError):
+                continue
+            self.add_hotspots(conn, row["id"], metadata)
+
+    def hotspot_key(self, conn, report_id):
+        """Return the (project, day, branch) a report's counters roll up into"""
+        return tuple(conn.execute("""
+            SELECT COALESCE(gitlab_project, ''), CAST(DATE(created_at) AS TEXT),
+                   COALESCE(git_branch, '')
+            FROM reports WHERE id = ?
+        """, (report_id,)).fetchone())
+
+    def add_hotspots(self, conn, report_id, metadata):
+        """Record per-rule and per-path counts of a report and bump the rollups"""
+        project, day, branch = self.hotspot_key(conn, report_id)
+        for kind, counts in (("rule", metadata["rule_counts"]), ("file", metadata["file_counts"])):
+            conn.executemany("""
+                INSERT INTO report_hotspots (report_id, kind, name, findings)
+                VALUES (?, ?, ?, ?)
+            """, [(report_id, kind, name, count) for name, count in counts.items()])
+            conn.executemany("""
+                INSERT INTO hotspot_counters (kind, project, day, branch, name, findings, reports)
+                VALUES (?, ?, ?, ?, ?, ?, 1)
+                ON CONFLICT (kind, project, day, branch, name) DO UPDATE SET
+                    findings = hotspot_counters.findings + excluded.findings,
+                    reports = hotspot_counters.reports + 1
+            """, [(kind, project, day, branch, name, count) for name, count in counts.items()])
+
+    def remove_hotspots(self, conn, report_id):
+        """Subtract a report's counts from the rollups before it is deleted"""
+        project, day, branch = self.hotspot_key(conn, report_id)
+        rows = conn.execute("""
+            SELECT kind, name, findings FROM report_hotspots WHERE report_id = ?
+        """, (report_id,)).fetchall()
+        conn.executemany("""
+            UPDATE hotspot_counters
+            SET findings = findings - ?, reports = reports - 1
+            WHERE kind = ? AND project = ? AND day = ? AND branch = ? AND name = ?
+        """, [(row["findings"], row["kind"], project, day, branch, row["name"]) for row in rows])
+        # Only the keys touched above can have dropped to zero; each delete is a primary key lookup
+        conn.executemany("""
+            DELETE FROM hotspot_counters
+            WHERE kind = ? AND project = ? AND day = ? AND branch = ? AND name = ? AND reports <= 0
+        """, [(row["kind"], project, day, branch, row["name"]) for row in rows])
+        conn.execute("DELETE FROM report_hotspots WHERE report_id = ?", (report_id,))
+
+    def get_top_hotspots(self, kind, filters=None, limit=10):
+        """Top-K rules or paths by findings, read from the rolled-up counters
+
+        Supports the date_from, date_to, branch and project filters.
+        """
+        if filters is None:
+            filters = {}
+
+        # PostgreSQL sums BIGINT columns to NUMERIC (Decimal in psycopg2),
+        # which the JSON encoders reject; the cast keeps plain integers
+        query = """
+            SELECT name, CAST(SUM(findings) AS BIGINT) AS findings, CAST(SUM(reports) AS BIGINT) AS reports
+            FROM hotspot_counters
+            WHERE kind = ?
+        """
+        params = [kind]
+
+        if filters.get("project"):
+            query += " AND project = ?"
+            params.append(filters["project"])
+        if filters.get("branch"):
+            query += " AND branch = ?"
+            params.append(filters["branch"])
+        for key, operator in (("date_from", ">="), ("date_to", "<=")):
+            if filters.get(key):
                 try:
-                    conn.execute(f"ALTER TABLE reports ADD COLUMN {column_name} {column_type}")
-                    conn.commit()
-                except sqlite3.OperationalError:
-                    # Column already exists, ignore
+                    day = datetime.strptime(filters[key], "%Y-%m-%d")
+                    query += f" AND day {operator} ?"
+                    params.append(day.strftime("%Y-%m-%d"))
+                except ValueError:
                     pass
+
+        query += " GROUP BY name ORDER BY findings DESC, name LIMIT ?"
+        params.append(limit)
+
+        conn = self.get_connection(analytic=True)
+        try:
+            return [dict(row) for row in conn.execute(query, params).fetchall()]
         finally:
             conn.close()
 
@@ -92,6 +525,8 @@ class ReportDB:
             "severity_medium": 0,
             "severity_low": 0,
             "severity_info": 0,
+            "rule_counts": Counter(),
+            "file_counts": Counter(),
         }
 
         # Check if SARIF format
@@ -103,18 +538,18 @@ class ReportDB:
                     issues.append(result)
             
             metadata["total_findings"] = len(issues)
-            files = set()
-            rules = set()
+            files = metadata["file_counts"]
+            rules = metadata["rule_counts"]
             
             for issue in issues:
                 location = issue.get("locations", [{}])[0].get("physicalLocation", {})
                 file_uri = location.get("artifactLocation", {}).get("uri", "")
                 if file_uri:
-                    files.add(file_uri)
+                    files[file_uri] += 1
                 
                 rule_id = issue.get("ruleId", "")
                 if rule_id:
-                    rules.add(rule_id)
+                    rules[rule_id] += 1
                 
                 # Extract severity
                 severity = issue.get("level", "").lower()
@@ -138,17 +573,17 @@ class ReportDB:
             issues = report_data.get("results", [])
             metadata["total_findings"] = len(issues)
             
-            files = set()
-            rules = set()
+            files = metadata["file_counts"]
+            rules = metadata["rule_counts"]
             
             for issue in issues:
                 file_path = issue.get("path", "")
                 if file_path:
-                    files.add(file_path)
+                    files[file_path] += 1
                 
                 rule_id = issue.get("check_id", "")
                 if rule_id:
-                    rules.add(rule_id)
+                    rules[rule_id] += 1
                 
                 # Extract severity
                 severity = issue.get("extra", {}).get("severity", "info").lower()
@@ -168,13 +603,14 @@ class ReportDB:
 
         return metadata
 
-    def save_report(self, filename, stored_filename, file_path, report_data, git_metadata=None):
+    def save_report(self, filename, stored_filename, file_path, report_data, git_metadata=None,
+                    content_sha256=None):
         """Save report file and metadata to database
         
         Args:
             filename: Original filename
             stored_filename: Stored filename on disk
-            file_path: Full path to file
+            file_path: Location of the stored blob (path or URL)
             report_data: Parsed report JSON data
             git_metadata: Optional dict with GitLab metadata:
                 - git_tag: Git tag
@@ -184,6 +620,7 @@ class ReportDB:
                 - gitlab_job_id: GitLab job ID
                 - gitlab_project: Project name
                 - gitlab_project_url: Project URL
+            content_sha256: Optional hex SHA-256 of the uploaded file
         """
         metadata = self.extract_metadata(report_data)
         git_metadata = git_metadata or {}
@@ -198,8 +635,10 @@ class ReportDB:
                     severity_low, severity_info,
                     git_tag, git_commit, git_branch,
                     gitlab_pipeline_id, gitlab_job_id,
-                    gitlab_project, gitlab_project_url
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    gitlab_project, gitlab_project_url,
+                    content_sha256
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                RETURNING id
             """, (
                 filename,
                 stored_filename,
@@ -220,206 +659,170 @@ class ReportDB:
                 git_metadata.get("gitlab_job_id"),
                 git_metadata.get("gitlab_project"),
                 git_metadata.get("gitlab_project_url"),
+                content_sha256,
             ))
+            report_id = cursor.fetchone()[0]
+            self.add_hotspots(conn, report_id, metadata)
+            row = self.fetch_report_row(conn, "id = ?", (report_id,))
+            if row is not None:
+                self.enqueue_event(conn, "report_added", row)
             conn.commit()
-            return cursor.lastrowid
         finally:
             conn.close()
 
-    def get_all_reports(self, filters=None):
-        """Get all reports ordered by creation date, with optional filters"""
-        if filters is None:
-            filters = {}
-        
-        conn = self.get_connection()
-        try:
-            query = """
-                SELECT id, filename, stored_filename, file_path,
-                       report_type, total_findings, total_files, total_rules,
-                       severity_critical, severity_high, severity_medium,
-                       severity_low, severity_info,
-                       git_tag, git_commit, git_branch,
-                       gitlab_pipeline_id, gitlab_job_id,
-                       gitlab_project, gitlab_project_url,
-                       created_at
-                FROM reports
-                WHERE 1=1
-            """
-            params = []
-            
-            # Filter by report type
-            if filters.get("report_type"):
-                report_types = filters["report_type"]
-                if isinstance(report_types, str):
-                    report_types = [report_types]
-                if report_types:
-                    placeholders = ",".join(["?"] * len(report_types))
-                    query += f" AND ("
-                    conditions = []
-                    for rt in report_types:
-                        if rt == "JSON":
-                            conditions.append("report_type LIKE ?")
-                            params.append("%JSON%")
-                        elif rt == "SARIF":
-                            conditions.append("report_type LIKE ?")
-                            params.append("%SARIF%")
-                    if conditions:
-                        query += " OR ".join(conditions) + ")"
-            
-            # Filter by severity - show report if it has at least one issue of selected severity
-            if filters.get("severity"):
-                severities = filters["severity"]
-                if isinstance(severities, str):
-                    severities = [severities]
-                elif not isinstance(severities, list):
-                    severities = []
-                if severities:
-                    query += " AND ("
-                    conditions = []
-                    for sev in severities:
-                        if sev in ["critical", "high", "medium", "low", "info"]:
-                            conditions.append(f"severity_{sev} > 0")
-                    if conditions:
-                        query += " OR ".join(conditions) + ")"
-                    else:
-                        # If no valid severities, return no results
-                        query += " AND 1=0"
-            
-            # Filter by date range
-            if filters.get("date_from"):
-                try:
-                    date_from = datetime.strptime(filters["date_from"], "%Y-%m-%d")
-                    query += " AND DATE(created_at) >= ?"
-                    params.append(date_from.strftime("%Y-%m-%d"))
-                except ValueError:
-                    pass
-            
-            if filters.get("date_to"):
-                try:
-                    date_to = datetime.strptime(filters["date_to"], "%Y-%m-%d")
-                    query += " AND DATE(created_at) <= ?"
-                    params.append(date_to.strftime("%Y-%m-%d"))
-                except ValueError:
-                    pass
-            
-            # Filter by search query (filename, git metadata)
-            if filters.get("search"):
-                search_term = f"%{filters['search']}%"
-                query += """ AND (
-                    filename LIKE ? OR
-                    git_tag LIKE ? OR
-                    git_branch LIKE ? OR
-                    git_commit LIKE ?
-                )"""
-                params.extend([search_term] * 4)
-            
-            query += " ORDER BY created_at DESC"
-            
-            # Debug: print query for troubleshooting
-            # print(f"Query: {query}")
-            # print(f"Params: {params}")
-            
-            cursor = conn.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
-        finally:
-            conn.close()
+        if row is not None:
+            self.after_commit("report_added", row)
+        return report_id
+
+    def build_filter_clause(self, filters=None):
+        """Build WHERE conditions shared by report listings and totals
 
-    def get_totals(self, filters=None):
-        """Get aggregate totals across filtered reports"""
+        Returns a (sql, params) tuple; sql starts with " AND" or is empty.
+        """
         if filters is None:
             filters = {}
-        
-        conn = self.get_connection()
+
+        query = ""
+        params = []
+
+        # Filter by report type
+        if filters.get("report_type"):
+            report_types = filters["report_type"]
+            if isinstance(report_types, str):
+                report_types = [report_types]
+            conditions = []
+            for rt in report_types:
+                if rt == "JSON":
+                    conditions.append("report_type LIKE ?")
+                    params.append("%JSON%")
+                elif rt == "SARIF":
+                    conditions.append("report_type LIKE ?")
+                    params.append("%SARIF%")
+            if conditions:
+                query += " AND (" + " OR ".join(conditions) + ")"
+
+        # Filter by severity - show report if it has at least one issue of selected severity
+        if filters.get("severity"):
+            severities = filters["severity"]
+            if isinstance(severities, str):
+                severities = [severities]
+            elif not isinstance(severities, list):
+                severities = []
+            conditions = [
+                f"severity_{sev} > 0"
+                for sev in severities
+                if sev in ["critical", "high", "medium", "low", "info"]
+            ]
+            if conditions:
+                query += " AND (" + " OR ".join(conditions) + ")"
+            else:
+                # If no valid severities, return no results
+                query += " AND 1=0"
+
+        # Filter by date range
+        if filters.get("date_from"):
+            try:
+                date_from = datetime.strptime(filters["date_from"], "%Y-%m-%d")
+                query += " AND DATE(created_at) >= ?"
+                params.append(date_from.strftime("%Y-%m-%d"))
+            except ValueError:
+                pass
+
+        if filters.get("date_to"):
+            try:
+                date_to = datetime.strptime(filters["date_to"], "%Y-%m-%d")
+                query += " AND DATE(created_at) <= ?"
+                params.append(date_to.strftime("%Y-%m-%d"))
+            except ValueError:
+                pass
+
+        # Exact branch / project match
+        if filters.get("branch"):
+            query += " AND git_branch = ?"
+            params.append(filters["branch"])
+
+        if filters.get("project"):
+            query += " AND gitlab_project = ?"
+            params.append(filters["project"])
+
+        # Filter by search query (filename, git metadata)
+        if filters.get("search"):
+            search_term = f"%{filters['search']}%"
+            query += """ AND (
+                filename LIKE ? OR
+                git_tag LIKE ? OR
+                git_branch LIKE ? OR
+                git_commit LIKE ?
+            )"""
+            params.extend([search_term] * 4)
+
+        return query, params
+
+    def iter_reports(self, filters=None, batch_size=FETCH_BATCH_SIZE):
+        """Yield report rows as plain tuples ordered like REPORT_COLUMNS"""
+        where, params = self.build_filter_clause(filters)
+        query = f"""
+            SELECT {", ".join(REPORT_COLUMNS)}
+            FROM reports
+            WHERE 1=1{where}
+            ORDER BY created_at DESC
+        """
+        return self.stream_rows(query, params, batch_size=batch_size)
+
+    def iter_export_reports(self, filters=None, batch_size=FETCH_BATCH_SIZE):
+        """Yield report rows ordered like EXPORT_REPORT_FIELDS, oldest first"""
+        columns = [self.created_at_text(name) if name == "created_at" else name for name in EXPORT_REPORT_FIELDS]
+        where, params = self.build_filter_clause(filters)
+        query = f"""
+            SELECT {", ".join(columns)}
+            FROM reports
+            WHERE 1=1{where}
+            ORDER BY id
+        """
+        return self.stream_rows(query, params, analytic=True, batch_size=batch_size)
+
+    def iter_export_hotspots(self, filters=None, batch_size=FETCH_BATCH_SIZE):
+        """Yield per-report rule/path counts ordered like EXPORT_HOTSPOT_FIELDS
+
+        Individual findings are not stored, so these counts are the finest
+        grain available without re-parsing the report files.
+        """
+        where, params = self.build_filter_clause(filters)
+        query = f"""
+            SELECT report_hotspots.report_id, {self.created_at_text("reports.created_at")},
+                   gitlab_project, git_branch, git_commit,
+                   report_hotspots.kind, report_hotspots.name, report_hotspots.findings
+            FROM report_hotspots
+            JOIN reports ON reports.id = report_hotspots.report_id
+            WHERE 1=1{where}
+            ORDER BY report_hotspots.report_id, report_hotspots.kind, report_hotspots.name
+        """
+        return self.stream_rows(query, params, analytic=True, batch_size=batch_size)
+
+    def created_at_text(self, column):
+        """SQL rendering column as 'YYYY-MM-DD HH:MM:SS' text"""
+        return f"{column} AS created_at"
+
+    def stream_cursor(self, conn):
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        return cursor
+
+    def stream_rows(self, query, params, analytic=False, batch_size=FETCH_BATCH_SIZE):
+        """Yield the rows of query as plain tuples
+
+        Rows are pulled from the cursor in batches so large results are
+        never materialized in memory at once.
+        """
+        conn = self.get_connection(analytic=analytic)
         try:
-            query = """
-                SELECT 
-                    COUNT(*) as total_reports,
-                    SUM(total_findings) as total_findings,
-                    SUM(total_files) as total_files,
-                    SUM(total_rules) as total_rules,
-                    SUM(severity_critical) as total_critical,
-                    SUM(severity_high) as total_high,
-                    SUM(severity_medium) as total_medium,
-                    SUM(severity_low) as total_low,
-                    SUM(severity_info) as total_info
-                FROM reports
-                WHERE 1=1
-            """
-            params = []
-            
-            # Apply same filters as get_all_reports
-            if filters.get("report_type"):
-                report_types = filters["report_type"]
-                if isinstance(report_types, str):
-                    report_types = [report_types]
-                if report_types:
-                    placeholders = ",".join(["?"] * len(report_types))
-                    query += f" AND ("
-                    conditions = []
-                    for rt in report_types:
-                        if rt == "JSON":
-                            conditions.append("report_type LIKE ?")
-                            params.append("%JSON%")
-                        elif rt == "SARIF":
-                            conditions.append("report_type LIKE ?")
-                            params.append("%SARIF%")
-                    if conditions:
-                        query += " OR ".join(conditions) + ")"
-            
-            if filters.get("severity"):
-                severities = filters["severity"]
-                if isinstance(severities, str):
-                    severities = [severities]
-                if severities:
-                    query += " AND ("
-                    conditions = []
-                    for sev in severities:
-                        if sev in ["critical", "high", "medium", "low", "info"]:
-                            conditions.append(f"severity_{sev} > 0")
-                    if conditions:
-                        query += " OR ".join(conditions) + ")"
-            
-            if filters.get("date_from"):
-                try:
-                    date_from = datetime.strptime(filters["date_from"], "%Y-%m-%d")
-                    query += " AND DATE(created_at) >= ?"
-                    params.append(date_from.strftime("%Y-%m-%d"))
-                except ValueError:
-                    pass
-            
-            if filters.get("date_to"):
-                try:
-                    date_to = datetime.strptime(filters["date_to"], "%Y-%m-%d")
-                    query += " AND DATE(created_at) <= ?"
-                    params.append(date_to.strftime("%Y-%m-%d"))
-                except ValueError:
-                    pass
-            
-            if filters.get("search"):
-                search_term = f"%{filters['search']}%"
-                query += """ AND (
-                    filename LIKE ? OR
-                    git_tag LIKE ? OR
-                    git_branch LIKE ? OR
-                    git_commit LIKE ?
-                )"""
-                params.extend([search_term] * 4)
-            
-            cursor = conn.execute(query, params)
-            row = cursor.fetchone()
-            if row:
-                return dict(row)
-            return {
-                    "total_reports": 0,
-                    "total_findings": 0,
-                    "total_files": 0,
-                    "total_rules": 0,
-                    "total_critical": 0,
-                    "total_high": 0,
-                    "total_medium": 0,
-                    "total_low": 0,
-                    "total_info": 0,
-                }
+            cursor = self.stream_cursor(conn)
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
         finally:
             conn.close()
 
@@ -435,26 +838,923 @@ class ReportDB:
         finally:
             conn.close()
 
+    def get_report_by_hash(self, content_sha256, match=None):
+        """Get the most recent report whose file has the given SHA-256, as a tuple row
+
+        match maps HASH_MATCH_FIELDS columns to values the report must also have.
+        """
+        conditions = "".join(f" AND {column} = ?" for column in (match or {}) if column in HASH_MATCH_FIELDS)
+        params = [content_sha256] + [value for column, value in (match or {}).items() if column in HASH_MATCH_FIELDS]
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(f"""
+                SELECT {", ".join(REPORT_COLUMNS)} FROM reports
+                WHERE content_sha256 = ?{conditions}
+                ORDER BY created_at DESC
+                LIMIT 1
+            """, params)
+            return cursor.fetchone()
+        finally:
+            conn.close()
+
     def delete_report(self, stored_filename):
         """Delete report from database"""
         conn = self.get_connection()
         try:
+            row = self.fetch_report_row(conn, "stored_filename = ?", (stored_filename,))
+            if row is not None:
+                self.remove_hotspots(conn, row[COL["id"]])
             cursor = conn.execute("""
                 DELETE FROM reports WHERE stored_filename = ?
             """, (stored_filename,))
+            deleted = cursor.rowcount > 0
+            if deleted and row is not None:
+                self.enqueue_event(conn, "report_deleted", row)
             conn.commit()
-            return cursor.rowcount > 0
         finally:
             conn.close()
 
+        if deleted and row is not None:
+            self.after_commit("report_deleted", row)
+        return deleted
 
-# Initialize database
-db = ReportDB(DB_PATH)
 
+class DatabaseBusyError(RuntimeError):
+    """No database connection became free within the pool wait time"""
+
+
+class PostgresCursor:
+    """sqlite3-style cursor over psycopg2 that accepts "?" placeholders"""
+
+    row_factory = None
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def execute(self, query, params=()):
+        self.cursor.execute(query.replace("?", "%s"), params)
+        return self
+
+    def executemany(self, query, seq_of_params):
+        self.cursor.executemany(query.replace("?", "%s"), seq_of_params)
+        return self
+
+    def fetchone(self):
+        return self.cursor.fetchone()
+
+    def fetchmany(self, size):
+        return self.cursor.fetchmany(size)
+
+    def fetchall(self):
+        return self.cursor.fetchall()
+
+    @property
+    def rowcount(self):
+        return self.cursor.rowcount
+
+
+class PostgresConnection:
+    """sqlite3-style facade over a pooled psycopg2 connection
+
+    Lets the ReportDB queries run unchanged against PostgreSQL.
+    """
+
+    def __init__(self, pool, conn, release):
+        self.pool = pool
+        self.conn = conn
+        self.release = release
+
+    def cursor(self, name=None):
+        if name is not None:
+            # Named cursors live on the server and return plain tuples
+            return PostgresCursor(self.conn.cursor(name=name))
+        return PostgresCursor(self.conn.cursor(cursor_factory=psycopg2.extras.DictCursor))
+
+    def execute(self, query, params=()):
+        return self.cursor().execute(query, params)
+
+    def executemany(self, query, seq_of_params):
+        return self.cursor().executemany(query, seq_of_params)
+
+    def commit(self):
+        self.conn.commit()
+
+    def rollback(self):
+        self.conn.rollback()
+
+    def close(self):
+        # Discard any unfinished transaction before handing the connection
+        # back; connections broken e.g. by a server restart are dropped
+        broken = bool(self.conn.closed)
+        if not broken:
+            try:
+                self.conn.rollback()
+            except psycopg2.Error:
+                broken = True
+        try:
+            self.pool.putconn(self.conn, close=broken)
+        finally:
+            self.release()
+
+
+class PostgresReportDB(ReportDB):
+    """ReportDB on a shared PostgreSQL server, so several replicas can run at once
+
+    Report events are relayed through LISTEN/NOTIFY, so every replica's
+    listeners see writes made by the others.
+    """
+
+    def __init__(self, dsn, pool_size=DB_POOL_SIZE):
+        # Fail at startup if the driver is missing, but import it on first use
+        if importlib.util.find_spec("psycopg2") is None:
+            raise RuntimeError("DATABASE_URL points to PostgreSQL, but psycopg2 is not installed")
+        self.dsn = dsn
+        self.pool_size = pool_size
+        # The pool connects on first use, so the server starts without waiting for the database
+        self.pool = None
+        self.pool_lock = threading.Lock()
+        # getconn() fails instead of waiting when the pool is exhausted, so
+        # callers queue here for a bounded time first
+        self.pool_slots = threading.BoundedSemaphore(pool_size)
+        self.listener_thread = None
+        super().__init__(dsn)
+
+    def connect(self):
+        if not self.pool_slots.acquire(timeout=DB_POOL_WAIT_SECONDS):
+            raise DatabaseBusyError("no free PostgreSQL connection")
+        try:
+            if self.pool is None:
+                with self.pool_lock:
+                    if self.pool is None:
+                        load_psycopg2()
+                        self.pool = psycopg2.pool.ThreadedConnectionPool(1, self.pool_size, self.dsn)
+            return PostgresConnection(self.pool, self.pool.getconn(), self.pool_slots.release)
+        except BaseException:
+            self.pool_slots.release()
+            raise
+
+    def get_schema_version(self, conn):
+        if conn.execute("SELECT to_regclass('reader_schema')").fetchone()[0] is None:
+            return 0
+        row = conn.execute("SELECT version FROM reader_schema").fetchone()
+        return row[0] if row else 0
+
+    def set_schema_version(self, conn, version):
+        conn.execute("CREATE TABLE IF NOT EXISTS reader_schema (version INTEGER NOT NULL)")
+        conn.execute("DELETE FROM reader_schema")
+        conn.execute("INSERT INTO reader_schema (version) VALUES (?)", (version,))
+
+    def begin_migration(self, conn):
+        # Serializes replicas starting at the same time; released on commit
+        conn.execute("SELECT pg_advisory_xact_lock(?)", (PG_MIGRATION_LOCK_ID,))
+
+    def configure_database(self, conn):
+        # PostgreSQL readers never block writers
+        pass
+
+    def created_at_text(self, column):
+        return f"to_char({column}, 'YYYY-MM-DD HH24:MI:SS') AS created_at"
+
+    def stream_cursor(self, conn):
+        # Server-side cursor: the result set stays in PostgreSQL and each
+        # fetchmany is one round trip. The pooled connection runs one
+        # stream at a time, so a fixed name is enough.
+        return conn.cursor(name="reader_stream")
+
+    def migrate_reports(self, conn):
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS reports (
+                id BIGSERIAL PRIMARY KEY,
+                filename TEXT NOT NULL,
+                stored_filename TEXT NOT NULL UNIQUE,
+                file_path TEXT NOT NULL,
+                report_type TEXT,
+                total_findings INTEGER DEFAULT 0,
+                total_files INTEGER DEFAULT 0,
+                total_rules INTEGER DEFAULT 0,
+                severity_critical INTEGER DEFAULT 0,
+                severity_high INTEGER DEFAULT 0,
+                severity_medium INTEGER DEFAULT 0,
+                severity_low INTEGER DEFAULT 0,
+                severity_info INTEGER DEFAULT 0,
+                git_tag TEXT,
+                git_commit TEXT,
+                git_branch TEXT,
+                gitlab_pipeline_id TEXT,
+                gitlab_job_id TEXT,
+                gitlab_project TEXT,
+                gitlab_project_url TEXT,
+                content_sha256 TEXT,
+                created_at TIMESTAMP DEFAULT (now() AT TIME ZONE 'utc'),
+                updated_at TIMESTAMP DEFAULT (now() AT TIME ZONE 'utc')
+            )
+        """)
+        conn.execute("ALTER TABLE reports ADD COLUMN IF NOT EXISTS content_sha256 TEXT")
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_reports_content_sha256
+            ON reports (content_sha256)
+        """)
+
+    def migrate_hotspots(self, conn):
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS report_hotspots (
+                report_id BIGINT NOT NULL,
+                kind TEXT NOT NULL,
+                name TEXT NOT NULL,
+                findings INTEGER NOT NULL,
+                PRIMARY KEY (report_id, kind, name)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS hotspot_counters (
+                kind TEXT NOT NULL,
+                project TEXT NOT NULL,
+                day TEXT NOT NULL,
+                branch TEXT NOT NULL,
+                name TEXT NOT NULL,
+                findings BIGINT NOT NULL DEFAULT 0,
+                reports BIGINT NOT NULL DEFAULT 0,
+                PRIMARY KEY (kind, project, day, branch, name)
+            )
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_hotspot_counters_day
+            ON hotspot_counters (kind, day)
+        """)
+
+    def start(self):
+        super().start()
+        if self.listener_thread is None:
+            self.listener_thread = threading.Thread(target=self.listen, name="pg-listener", daemon=True)
+            self.listener_thread.start()
+
+    def enqueue_event(self, conn, event, row):
+        # Sent on the writing connection: PostgreSQL delivers it only if the
+        # transaction commits, and no second pooled connection is needed
+        values = [v.isoformat(sep=" ") if isinstance(v, datetime) else v for v in row]
+        payload = dumps_json({"event": event, "row": values}).decode("utf-8")
+        conn.execute("SELECT pg_notify(?, ?)", (PG_EVENTS_CHANNEL, payload))
+
+    def after_commit(self, event, row):
+        # Local listeners get the event back through LISTEN, like every other replica
+        pass
+
+    def listen(self):
+        """Deliver notifications from every replica to the local listeners"""
+        load_psycopg2()
+        while True:
+            conn = None
+            try:
+                conn = psycopg2.connect(self.dsn)
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {PG_EVENTS_CHANNEL}")
+                while True:
+                    if select.select([conn], [], [], 60) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        message = json.loads(conn.notifies.pop(0).payload)
+                        self.notify(message["event"], tuple(message["row"]))
+            except psycopg2.Error as e:
+                print(f"PostgreSQL listener disconnected: {e}")
+                time.sleep(5)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+
+class BlobStore:
+    """Storage for uploaded report files"""
+
+    def save(self, name, data):
+        """Store data under name and return its location"""
+        raise NotImplementedError
+
+    def open(self, name):
+        """Return (readable, size); raise FileNotFoundError if name is missing"""
+        raise NotImplementedError
+
+    def delete(self, name):
+        """Remove name; missing blobs are ignored"""
+        raise NotImplementedError
+
+
+class LocalBlobStore(BlobStore):
+    """Files in a directory, local or shared between replicas (NFS, SMB)"""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def save(self, name, data):
+        # Created on first upload rather than at startup
+        self.directory.mkdir(parents=True, exist_ok=True)
+        target = self.directory / name
+        # Write under a temporary name so other replicas never see partial files
+        partial = self.directory / f".{name}.partial"
+        with partial.open("wb") as f:
+            f.write(data)
+        os.replace(partial, target)
+        return str(target)
+
+    def open(self, name):
+        f = (self.directory / name).open("rb")
+        return f, os.fstat(f.fileno()).st_size
+
+    def delete(self, name):
+        try:
+            (self.directory / name).unlink()
+        except FileNotFoundError:
+            pass
+
+
+class S3BlobStore(BlobStore):
+    """Objects in an S3-compatible bucket (AWS S3, MinIO, Ceph RGW)
+
+    Credentials come from the standard AWS environment variables.
+    """
+
+    def __init__(self, url, endpoint_url=None):
+        # Fail at startup if boto3 is missing, but import it on first use
+        if importlib.util.find_spec("boto3") is None:
+            raise RuntimeError("BLOB_STORAGE_URL points to S3, but boto3 is not installed")
+        parsed = urlparse(url)
+        self.bucket = parsed.netloc
+        self.prefix = parsed.path.strip("/")
+        self.endpoint_url = endpoint_url
+        self.s3_client = None
+        self.client_lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self.s3_client is None:
+            with self.client_lock:
+                if self.s3_client is None:
+                    boto3 = importlib.import_module("boto3")
+                    self.s3_client = boto3.client("s3", endpoint_url=self.endpoint_url)
+        return self.s3_client
+
+    def key(self, name):
+        return f"{self.prefix}/{name}" if self.prefix else name
+
+    def save(self, name, data):
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=self.key(name),
+            Body=data,
+            ContentType=mimetypes.guess_type(name)[0] or "application/octet-stream",
+        )
+        return f"s3://{self.bucket}/{self.key(name)}"
+
+    def open(self, name):
+        try:
+            obj = self.client.get_object(Bucket=self.bucket, Key=self.key(name))
+        except self.client.exceptions.NoSuchKey as e:
+            raise FileNotFoundError(name) from e
+        return obj["Body"], obj["ContentLength"]
+
+    def delete(self, name):
+        self.client.delete_object(Bucket=self.bucket, Key=self.key(name))
+
+
+def create_report_db():
+    if DATABASE_URL.startswith(("postgres://", "postgresql://")):
+        if SNAPSHOT_REFRESH_SECONDS > 0:
+            print("SNAPSHOT_REFRESH_SECONDS is ignored with PostgreSQL")
+        return PostgresReportDB(DATABASE_URL)
+    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    return ReportDB(DB_PATH, SNAPSHOT_PATH if SNAPSHOT_REFRESH_SECONDS > 0 else None)
+
+
+def create_blob_store():
+    if BLOB_STORAGE_URL.startswith("s3://"):
+        return S3BlobStore(BLOB_STORAGE_URL, S3_ENDPOINT_URL)
+    return LocalBlobStore(UPLOAD_DIR)
+
+
+# Initialize storage backends
+db = create_report_db()
+blobs = create_blob_store()
+
+
+def parse_report_filters(query_params):
+    """Map /reports query parameters onto ReportDB filters"""
+    filters = {}
+    if "severity" in query_params:
+        filters["severity"] = query_params["severity"]
+    if "report_type" in query_params:
+        filters["report_type"] = query_params["report_type"]
+    if "date_from" in query_params:
+        filters["date_from"] = query_params["date_from"][0] if query_params["date_from"] else None
+    if "date_to" in query_params:
+        filters["date_to"] = query_params["date_to"][0] if query_params["date_to"] else None
+    if "search" in query_params:
+        filters["search"] = query_params["search"][0] if query_params["search"] else None
+    if "branch" in query_params:
+        filters["branch"] = query_params["branch"][0] if query_params["branch"] else None
+    if "project" in query_params:
+        filters["project"] = query_params["project"][0] if query_params["project"] else None
+    return filters
+
+
+def prefetch(rows):
+    """Pull the first row now, so database errors surface before any headers are sent"""
+    rows = iter(rows)
+    for first in rows:
+        return chain((first,), rows)
+    return iter(())
+
+
+def parse_created_at(created_at):
+    """Convert a stored created_at value to a unix timestamp"""
+    if isinstance(created_at, datetime):
+        return created_at.timestamp()
+    if isinstance(created_at, str):
+        try:
+            # Handles SQLite "YYYY-MM-DD HH:MM:SS" as well as ISO 8601 values
+            dt = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+            return dt.timestamp()
+        except Exception:
+            return time.time()
+    if isinstance(created_at, (int, float)):
+        return float(created_at)
+    return time.time()
+
+
+def serialize_report(row, origin):
+    """Build the API representation of a report row (tuple ordered like REPORT_COLUMNS)"""
+    file_data = {
+        "id": row[COL["id"]],
+        "name": row[COL["filename"]],
+        "url": f"{origin}/uploads/{row[COL['stored_filename']]}",
+        "created": parse_created_at(row[COL["created_at"]]),
+        "report_type": row[COL["report_type"]],
+        "total_findings": row[COL["total_findings"]],
+        "total_files": row[COL["total_files"]],
+        "total_rules": row[COL["total_rules"]],
+        "severity": {
+            "critical": row[COL["severity_critical"]],
+            "high": row[COL["severity_high"]],
+            "medium": row[COL["severity_medium"]],
+            "low": row[COL["severity_low"]],
+            "info": row[COL["severity_info"]],
+        }
+    }
+
+    # Add GitLab metadata if present
+    git_metadata = {}
+    for key, column in (
+        ("tag", "git_tag"),
+        ("commit", "git_commit"),
+        ("branch", "git_branch"),
+        ("pipeline_id", "gitlab_pipeline_id"),
+        ("job_id", "gitlab_job_id"),
+        ("project", "gitlab_project"),
+        ("project_url", "gitlab_project_url"),
+    ):
+        value = row[COL[column]]
+        if value:
+            git_metadata[key] = value
+
+    if git_metadata:
+        file_data["git"] = git_metadata
+
+    return file_data
+
+
+class ReportTotals:
+    """Aggregate totals summed up from report rows while they are streamed"""
+
+    SUMMED = (
+        ("total_findings", COL["total_findings"]),
+        ("total_files", COL["total_files"]),
+        ("total_rules", COL["total_rules"]),
+        ("total_critical", COL["severity_critical"]),
+        ("total_high", COL["severity_high"]),
+        ("total_medium", COL["severity_medium"]),
+        ("total_low", COL["severity_low"]),
+        ("total_info", COL["severity_info"]),
+    )
+
+    def __init__(self):
+        self.total_reports = 0
+        self.sums = [0] * len(self.SUMMED)
+
+    def count(self, rows):
+        """Pass rows (tuples ordered like REPORT_COLUMNS) through, adding them up"""
+        sums = self.sums
+        for row in rows:
+            self.total_reports += 1
+            for i, (_, index) in enumerate(self.SUMMED):
+                sums[i] += row[index] or 0
+            yield row
+
+    def as_dict(self):
+        totals = {"total_reports": self.total_reports}
+        totals.update((name, total) for (name, _), total in zip(self.SUMMED, self.sums))
+        return totals
+
+
+def serialize_totals(totals):
+    """Build the API representation of aggregate totals"""
+    return {
+        "total_reports": totals.get("total_reports", 0) or 0,
+        "total_findings": totals.get("total_findings", 0) or 0,
+        "total_files": totals.get("total_files", 0) or 0,
+        "total_rules": totals.get("total_rules", 0) or 0,
+        "severity": {
+            "critical": totals.get("total_critical", 0) or 0,
+            "high": totals.get("total_high", 0) or 0,
+            "medium": totals.get("total_medium", 0) or 0,
+            "low": totals.get("total_low", 0) or 0,
+            "info": totals.get("total_info", 0) or 0,
+        }
+    }
+
+
+def negotiate_encoding(accept_encoding):
+    """Pick the best supported content coding from an Accept-Encoding header"""
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name] = quality
+
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    for encoding in candidates:
+        if accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return None
+
+
+def compress(data, encoding):
+    """Compress a complete body with the given content coding"""
+    if encoding == "br":
+        return brotli.compress(data)
+    if encoding == "gzip":
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+    return data
+
+
+class StreamCompressor:
+    """Incremental compressor with a common interface for gzip and brotli"""
+
+    def __init__(self, encoding):
+        if encoding == "br":
+            self._compressor = brotli.Compressor()
+            self._compress = self._compressor.process
+            self._finish = self._compressor.finish
+        else:
+            self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+            self._compress = self._compressor.compress
+            self._finish = self._compressor.flush
+
+    def compress(self, data):
+        return self._compress(bytes(data))
+
+    def finish(self):
+        return self._finish()
+
+
+class StaticAsset:
+    """Frontend file kept in memory with precompressed variants"""
+
+    def __init__(self, path):
+        self.body = path.read_bytes()
+        self.content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        if self.content_type.startswith("text/") or self.content_type.endswith("javascript"):
+            self.content_type += "; charset=utf-8"
+        self.last_modified = path.stat().st_mtime
+        digest = hashlib.sha256(self.body).hexdigest()[:32]
+
+        # Strong ETags must differ between representations
+        self.variants = {None: (self.body, f'"{digest}"')}
+        encodings = ["gzip", "br"] if brotli is not None else ["gzip"]
+        for encoding in encodings:
+            compressed = compress(self.body, encoding)
+            if len(compressed) < len(self.body):
+                self.variants[encoding] = (compressed, f'"{digest}-{encoding}"')
+
+    def variant(self, encoding):
+        if encoding in self.variants:
+            return encoding, self.variants[encoding]
+        return None, self.variants[None]
+
+
+static_assets = {}
+static_assets_lock = threading.Lock()
+
+
+def get_static_asset(url_path):
+    """Return the in-memory asset for url_path, reading and compressing it on first request"""
+    name = "index.html" if url_path in ("", "/") else url_path.lstrip("/")
+    if name not in STATIC_ASSETS:
+        return None
+    asset = static_assets.get(name)
+    if asset is None:
+        with static_assets_lock:
+            asset = static_assets.get(name)
+            if asset is None:
+                path = BASE_DIR / name
+                if not path.is_file():
+                    return None
+                asset = static_assets[name] = StaticAsset(path)
+    return asset
+
+
+HEADER_PARAM_RE = re.compile(r';\s*([\w-]+)\s*=\s*(?:"((?:[^"\\]|\\.)*)"|([^;\s]*))')
+
+
+def parse_header_params(value):
+    """Parse the `key=value; key="quoted"` parameters of a header value"""
+    params = {}
+    for match in HEADER_PARAM_RE.finditer(value or ""):
+        quoted, plain = match.group(2), match.group(3)
+        params[match.group(1).lower()] = quoted.replace('\\"', '"') if quoted is not None else plain
+    return params
+
+
+def parse_multipart(body, content_type):
+    """Split a multipart/form-data body into {name: {"filename": ..., "data": bytes}}
+
+    The first part with a given name wins. Raises ValueError on malformed input.
+    """
+    if not (content_type or "").lower().startswith("multipart/form-data"):
+        raise ValueError("ожидается multipart/form-data")
+    boundary = parse_header_params(content_type).get("boundary")
+    if not boundary:
+        raise ValueError("не указан boundary")
+
+    fields = {}
+    delimiter = b"\r\n--" + boundary.encode("latin-1")
+    for part in (b"\r\n" + body).split(delimiter)[1:]:
+        if part.startswith(b"--"):
+            break
+        head, separator, data = part.partition(b"\r\n\r\n")
+        if not separator:
+            raise ValueError("повреждённая часть multipart")
+
+        headers = {}
+        for line in head.decode("utf-8", "replace").split("\r\n"):
+            name, _, value = line.partition(":")
+            if value:
+                headers[name.strip().lower()] = value.strip()
+        disposition = parse_header_params(headers.get("content-disposition"))
+        name = disposition.get("name")
+        if name is not None and name not in fields:
+            fields[name] = {"filename": disposition.get("filename"), "data": data}
+    return fields
+
+
+class ChunkedWriter:
+    """Buffer small writes and flush them as HTTP/1.1 chunks
+
+    When chunked transfer encoding is not available (HTTP/1.0 clients) the
+    body is written as-is and delimited by closing the connection.
+    """
+
+    def __init__(self, wfile, chunked=True, chunk_size=STREAM_CHUNK_SIZE, encoding=None):
+        self.wfile = wfile
+        self.chunked = chunked
+        self.chunk_size = chunk_size
+        self.compressor = StreamCompressor(encoding) if encoding else None
+        self.buffer = bytearray()
+
+    def write(self, data):
+        self.buffer += data
+        if len(self.buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        data = self.buffer
+        if self.compressor is not None:
+            data = self.compressor.compress(data)
+        self._send(data)
+        self.buffer.clear()
+
+    def _send(self, data):
+        if not data:
+            return
+        if self.chunked:
+            self.wfile.write(b"%x\r\n" % len(data))
+            self.wfile.write(data)
+            self.wfile.write(b"\r\n")
+        else:
+            self.wfile.write(data)
+
+    def close(self):
+        self.flush()
+        if self.compressor is not None:
+            self._send(self.compressor.finish())
+        if self.chunked:
+            self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+class AdmissionController:
+    """Bounded lanes for ingest and read traffic plus a global upload byte budget
+
+    Acquisition waits at most `wait` seconds, so overload turns into quick
+    rejections instead of a growing queue.
+    """
+
+    def __init__(self, ingest_concurrency, read_concurrency, max_inflight_bytes, wait):
+        self.ingest_slots = threading.BoundedSemaphore(ingest_concurrency)
+        self.read_slots = threading.BoundedSemaphore(read_concurrency)
+        self.max_inflight_bytes = max_inflight_bytes
+        self.inflight_bytes = 0
+        self.condition = threading.Condition()
+        self.wait = wait
+
+    def acquire_ingest(self, nbytes):
+        if not self.ingest_slots.acquire(timeout=self.wait):
+            return False
+        with self.condition:
+            fits = self.condition.wait_for(
+                lambda: self.inflight_bytes + nbytes <= self.max_inflight_bytes,
+                timeout=self.wait,
+            )
+            if fits:
+                self.inflight_bytes += nbytes
+        if not fits:
+            self.ingest_slots.release()
+        return fits
+
+    def release_ingest(self, nbytes):
+        with self.condition:
+            self.inflight_bytes -= nbytes
+            self.condition.notify_all()
+        self.ingest_slots.release()
+
+    def acquire_read(self):
+        return self.read_slots.acquire(timeout=self.wait)
+
+    def release_read(self):
+        self.read_slots.release()
+
+
+admission = AdmissionController(
+    INGEST_CONCURRENCY, READ_CONCURRENCY, MAX_INFLIGHT_UPLOAD_BYTES, ADMISSION_WAIT_SECONDS
+)
+
+
+class EventBroker:
+    """Fan out server-sent events to subscribers from a single selector loop
+
+    Subscribed sockets are non-blocking and owned by the broker, so an idle
+    dashboard costs one file descriptor rather than a handler thread.
+    """
+
+    def __init__(self, heartbeat=SSE_HEARTBEAT_SECONDS, max_backlog=SSE_MAX_BACKLOG):
+        self.heartbeat = heartbeat
+        self.max_backlog = max_backlog
+        self.selector = selectors.DefaultSelector()
+        self.lock = threading.Lock()
+        self.backlog = {}
+        self.last_event_id = 0
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name="sse-broker", daemon=True)
+            self.thread.start()
+
+    def attach(self, sock, greeting=b""):
+        """Take over a subscriber socket; greeting (the response head) is
+        queued only once the socket is registered, so a client that reacts
+        to it cannot miss an event published in between"""
+        sock.setblocking(False)
+        with self.lock:
+            self.backlog[sock] = bytearray()
+            self.selector.register(sock, selectors.EVENT_READ)
+            self._send(sock, greeting)
+
+    def publish(self, event, data):
+        with self.lock:
+            self.last_event_id += 1
+            message = (
+                f"id: {self.last_event_id}\nevent: {event}\ndata: ".encode("utf-8")
+                + dumps_json(data)
+                + b"\n\n"
+            )
+            for sock in list(self.backlog):
+                self._send(sock, message)
+
+    def run(self):
+        last_heartbeat = time.monotonic()
+        while True:
+            ready = self.selector.select(timeout=self.heartbeat)
+            with self.lock:
+                for key, mask in ready:
+                    sock = key.fileobj
+                    if sock not in self.backlog:
+                        continue
+                    if mask & selectors.EVENT_READ:
+                        # Subscribers never send anything; readable means closed
+                        try:
+                            if not sock.recv(4096):
+                                self._drop(sock)
+                                continue
+                        except BlockingIOError:
+                            pass
+                        except OSError:
+                            self._drop(sock)
+                            continue
+                    if mask & selectors.EVENT_WRITE:
+                        self._send(sock, b"")
+                if time.monotonic() - last_heartbeat >= self.heartbeat:
+                    last_heartbeat = time.monotonic()
+                    for sock in list(self.backlog):
+                        self._send(sock, b": ping\n\n")
+
+    def _send(self, sock, data):
+        pending = self.backlog[sock]
+        pending += data
+        try:
+            sent = sock.send(pending) if pending else 0
+        except BlockingIOError:
+            sent = 0
+        except OSError:
+            self._drop(sock)
+            return
+        del pending[:sent]
+
+        if len(pending) > self.max_backlog:
+            self._drop(sock)
+            return
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if pending else 0)
+        if self.selector.get_key(sock).events != events:
+            self.selector.modify(sock, events)
+
+    def _drop(self, sock):
+        self.backlog.pop(sock, None)
+        try:
+            self.selector.unregister(sock)
+        except (KeyError, ValueError):
+            pass
+        try:
+            sock.close()
+        except OSError:
+            pass
+
+
+events = EventBroker()
+
+
+def publish_report_event(event, row):
+    """Translate ReportDB changes into small delta events for dashboards"""
+    if event == "report_added":
+        events.publish("report_added", serialize_report(row, origin=""))
+    elif event == "report_deleted":
+        events.publish("report_deleted", {
+            "id": row[COL["id"]],
+            "storedAs": row[COL["stored_filename"]],
+        })
+
+
+db.add_listener(publish_report_event)
+
+
+class ReaderServer(ThreadingHTTPServer):
+    """Threading server that lets handlers hand their socket over to the event broker"""
 
-class ReaderHandler(SimpleHTTPRequestHandler):
     def __init__(self, *args, **kwargs):
-        super().__init__(*args, directory=str(BASE_DIR), **kwargs)
+        super().__init__(*args, **kwargs)
+        self.detached = set()
+        self.detached_lock = threading.Lock()
+
+    def detach(self, request):
+        with self.detached_lock:
+            self.detached.add(request)
+
+    def shutdown_request(self, request):
+        with self.detached_lock:
+            if request in self.detached:
+                self.detached.discard(request)
+                return
+        super().shutdown_request(request)
+
+
+class ReaderHandler(SimpleHTTPRequestHandler):
+    # HTTP/1.1 keeps connections open between requests; every response
+    # must carry Content-Length or use chunked transfer encoding
+    protocol_version = "HTTP/1.1"
+    # A client trickling its upload body must not hold an ingest slot forever
+    timeout = REQUEST_TIMEOUT_SECONDS
 
     def do_POST(self):
         parsed = urlparse(self.path)
@@ -462,32 +1762,79 @@ class ReaderHandler(SimpleHTTPRequestHandler):
             self.send_error(404, "Not Found")
             return
 
-        form = cgi.FieldStorage(
-            fp=self.rfile,
-            headers=self.headers,
-            environ={
-                "REQUEST_METHOD": "POST",
-                "CONTENT_TYPE": self.headers.get("Content-Type"),
-                "CONTENT_LENGTH": self.headers.get("Content-Length"),
-            },
-        )
+        try:
+            content_length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            self.send_error(411, "Length Required")
+            return
+        if content_length < 0:
+            self.reject(400, "Некорректный Content-Length", retry_after=None)
+            return
+
+        # Oversized and excess uploads are refused before their body is read
+        if content_length > MAX_UPLOAD_BYTES:
+            self.reject(413, f"Файл слишком большой: максимум {MAX_UPLOAD_BYTES} байт", retry_after=None)
+            return
+        # A gzip body may inflate up to MAX_UPLOAD_BYTES, so that is what it reserves
+        reserved = content_length
+        if self.headers.get("Content-Encoding", "").strip().lower() == "gzip":
+            reserved = MAX_UPLOAD_BYTES
+        if not admission.acquire_ingest(reserved):
+            self.reject(429, "Сервер перегружен загрузками, повторите позже")
+            return
+        try:
+            self.receive_upload(content_length)
+        finally:
+            admission.release_ingest(reserved)
+
+    def receive_upload(self, content_length):
+        # The body is consumed in full so the persistent connection stays in sync
+        try:
+            body = self.read_body(content_length, UPLOAD_TIMEOUT_SECONDS)
+        except TimeoutError:
+            self.reject(408, "Тело запроса не получено вовремя", retry_after=None)
+            return
+        except ConnectionError:
+            self.close_connection = True
+            return
+
+        # CI clients may gzip the whole multipart body
+        content_encoding = self.headers.get("Content-Encoding", "identity").strip().lower()
+        if content_encoding == "gzip":
+            decompressor = zlib.decompressobj(31)
+            try:
+                body = decompressor.decompress(body, MAX_UPLOAD_BYTES + 1)
+            except zlib.error:
+                self.respond_json({"error": "Некорректное gzip-содержимое"}, status=400)
+                return
+            if len(body) > MAX_UPLOAD_BYTES or decompressor.unconsumed_tail:
+                self.respond_json({"error": f"Файл слишком большой: максимум {MAX_UPLOAD_BYTES} байт"}, status=413)
+                return
+        elif content_encoding != "identity":
+            self.respond_json({"error": f"Неподдерживаемый Content-Encoding: {content_encoding}"}, status=415)
+            return
+
+        try:
+            form = parse_multipart(body, self.headers.get("Content-Type"))
+        except ValueError as e:
+            self.respond_json({"error": f"Некорректный запрос: {e}"}, status=400)
+            return
 
-        file_item = form["report"] if "report" in form else None
-        if file_item is None or not getattr(file_item, "file", None):
+        file_item = form.get("report")
+        if file_item is None or file_item["filename"] is None:
             self.respond_json({"error": "Файл не получен"}, status=400)
             return
 
-        original_name = Path(file_item.filename or "report").name
-        safe_name = f"{int(time.time() * 1000)}-{original_name}"
+        original_name = Path(file_item["filename"] or "report").name
+        # Random suffix keeps names unique across replicas uploading in the same millisecond
+        safe_name = f"{int(time.time() * 1000)}-{os.urandom(3).hex()}-{original_name}"
         safe_name = safe_name.replace(" ", "_")
-        dest = UPLOAD_DIR / safe_name
 
         # Read file content
-        file_content = file_item.file.read()
+        file_content = file_item["data"]
         
-        # Save file to disk
-        with dest.open("wb") as f:
-            f.write(file_content)
+        # Save file to blob storage
+        location = blobs.save(safe_name, file_content)
 
         # Extract GitLab metadata from form fields
         # Support both direct names and CI_ prefixed GitLab CI variables
@@ -505,7 +1852,7 @@ class ReaderHandler(SimpleHTTPRequestHandler):
         for key, field_names in gitlab_fields.items():
             for field_name in field_names:
                 if field_name in form:
-                    value = form[field_name].value if hasattr(form[field_name], 'value') else str(form[field_name])
+                    value = form[field_name]["data"].decode("utf-8", "replace")
                     if value:
                         git_metadata[key] = value
                         break
@@ -513,22 +1860,30 @@ class ReaderHandler(SimpleHTTPRequestHandler):
         # Parse JSON and extract metadata
         try:
             report_data = json.loads(file_content.decode("utf-8"))
-            report_id = db.save_report(original_name, dest.name, dest, report_data, git_metadata)
+            report_id = db.save_report(
+                original_name, safe_name, location, report_data, git_metadata,
+                content_sha256=hashlib.sha256(file_content).hexdigest(),
+            )
+        except DatabaseBusyError:
+            # Nothing refers to the stored file yet; the client retries the whole upload
+            blobs.delete(safe_name)
+            self.reject(503, "База данных перегружена, повторите позже")
+            return
         except (json.JSONDecodeError, Exception) as e:
             # If parsing fails, still save the file but without metadata
             self.respond_json({
                 "error": f"Не удалось извлечь метаданные: {str(e)}",
-                "url": f"{self.server_origin()}/uploads/{dest.name}",
+                "url": f"{self.server_origin()}/uploads/{safe_name}",
                 "name": original_name,
-                "storedAs": dest.name
+                "storedAs": safe_name
             }, status=400)
             return
 
-        url = f"{self.server_origin()}/uploads/{dest.name}"
+        url = f"{self.server_origin()}/uploads/{safe_name}"
         response_data = {
             "url": url,
             "name": original_name,
-            "storedAs": dest.name,
+            "storedAs": safe_name,
             "id": report_id
         }
         # Include GitLab metadata in response if provided
@@ -538,113 +1893,132 @@ class ReaderHandler(SimpleHTTPRequestHandler):
 
     def do_GET(self):
         parsed = urlparse(self.path)
+        if parsed.path not in READ_LANE_PATHS and not parsed.path.startswith(READ_LANE_PREFIXES):
+            self.route_get(parsed)
+            return
+
+        if not admission.acquire_read():
+            self.reject(503, "Сервер перегружен, повторите позже")
+            return
+        try:
+            self.route_get(parsed)
+        except DatabaseBusyError:
+            self.reject(503, "База данных перегружена, повторите позже")
+        finally:
+            admission.release_read()
+
+    def route_get(self, parsed):
+        if parsed.path == "/healthz":
+            # Liveness only: answers before the database or storage is touched
+            payload = {"status": "ok"}
+            if db.snapshot_path is not None:
+                age = db.snapshot_age()
+                payload["snapshot_age"] = None if age is None else round(age, 1)
+            self.respond_json(payload)
+            return
+
         if parsed.path == "/reports":
-            # Parse query parameters
+            filters = parse_report_filters(parse_qs(parsed.query))
+            rows = prefetch(db.iter_reports(filters))
+            origin = self.server_origin()
+            totals = ReportTotals()
+            self.respond_json_stream(
+                prefix=b'{"files":[',
+                items=(serialize_report(row, origin) for row in totals.count(rows)),
+                suffix=lambda: b'],"totals":' + dumps_json(serialize_totals(totals.as_dict())) + b"}",
+            )
+            return
+
+        if parsed.path in ("/stats/top-rules", "/stats/top-files"):
             query_params = parse_qs(parsed.query)
-            filters = {}
-            
-            # Extract filter parameters
-            if "severity" in query_params:
-                filters["severity"] = query_params["severity"]
-            if "report_type" in query_params:
-                filters["report_type"] = query_params["report_type"]
-            if "date_from" in query_params:
-                filters["date_from"] = query_params["date_from"][0] if query_params["date_from"] else None
-            if "date_to" in query_params:
-                filters["date_to"] = query_params["date_to"][0] if query_params["date_to"] else None
-            if "search" in query_params:
-                filters["search"] = query_params["search"][0] if query_params["search"] else None
-            
-            reports = db.get_all_reports(filters)
-            totals = db.get_totals(filters)
-            files = []
-            for report in reports:
-                # Parse created_at timestamp (SQLite stores as string)
-                created_at = report["created_at"]
-                if isinstance(created_at, str):
-                    try:
-                        # Handle SQLite timestamp format: "YYYY-MM-DD HH:MM:SS"
-                        if "T" in created_at:
-                            dt = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-                        else:
-                            dt = datetime.strptime(created_at, "%Y-%m-%d %H:%M:%S")
-                        created_timestamp = dt.timestamp()
-                    except Exception:
-                        created_timestamp = time.time()
-                elif isinstance(created_at, (int, float)):
-                    created_timestamp = float(created_at)
-                else:
-                    created_timestamp = time.time()
-                
-                file_data = {
-                    "id": report["id"],
-                    "name": report["filename"],
-                    "url": f"{self.server_origin()}/uploads/{report['stored_filename']}",
-                    "created": created_timestamp,
-                    "report_type": report["report_type"],
-                    "total_findings": report["total_findings"],
-                    "total_files": report["total_files"],
-                    "total_rules": report["total_rules"],
-                    "severity": {
-                        "critical": report["severity_critical"],
-                        "high": report["severity_high"],
-                        "medium": report["severity_medium"],
-                        "low": report["severity_low"],
-                        "info": report["severity_info"],
-                    }
-                }
-                
-                # Add GitLab metadata if present
-                git_metadata = {}
-                if report.get("git_tag"):
-                    git_metadata["tag"] = report["git_tag"]
-                if report.get("git_commit"):
-                    git_metadata["commit"] = report["git_commit"]
-                if report.get("git_branch"):
-                    git_metadata["branch"] = report["git_branch"]
-                if report.get("gitlab_pipeline_id"):
-                    git_metadata["pipeline_id"] = report["gitlab_pipeline_id"]
-                if report.get("gitlab_job_id"):
-                    git_metadata["job_id"] = report["gitlab_job_id"]
-                if report.get("gitlab_project"):
-                    git_metadata["project"] = report["gitlab_project"]
-                if report.get("gitlab_project_url"):
-                    git_metadata["project_url"] = report["gitlab_project_url"]
-                
-                if git_metadata:
-                    file_data["git"] = git_metadata
-                
-                files.append(file_data)
+            kind, label = ("rule", "rule") if parsed.path == "/stats/top-rules" else ("file", "path")
+            try:
+                limit = int(query_params.get("limit", [TOP_DEFAULT_LIMIT])[0])
+            except ValueError:
+                limit = TOP_DEFAULT_LIMIT
+            limit = max(1, min(limit, TOP_MAX_LIMIT))
+
+            rows = db.get_top_hotspots(kind, parse_report_filters(query_params), limit)
             self.respond_json({
-                "files": files,
-                "totals": {
-                    "total_reports": totals.get("total_reports", 0) or 0,
-                    "total_findings": totals.get("total_findings", 0) or 0,
-                    "total_files": totals.get("total_files", 0) or 0,
-                    "total_rules": totals.get("total_rules", 0) or 0,
-                    "severity": {
-                        "critical": totals.get("total_critical", 0) or 0,
-                        "high": totals.get("total_high", 0) or 0,
-                        "medium": totals.get("total_medium", 0) or 0,
-                        "low": totals.get("total_low", 0) or 0,
-                        "info": totals.get("total_info", 0) or 0,
-                    }
-                }
-            })
-            return
-
-        # Strip query string so shared links like /?report=... return index.html
-        self.path = parsed.path or "/"
-        return super().do_GET()
+                "items": [
+                    {label: row["name"], "findings": row["findings"], "reports": row["reports"]}
+                    for row in rows
+                ],
+                "limit": limit,
+            }, headers=self.snapshot_headers())
+            return
+
+        if parsed.path in ("/export/reports", "/export/hotspots"):
+            query_params = parse_qs(parsed.query)
+            export_format = query_params.get("format", ["csv"])[0].lower()
+            if export_format not in EXPORT_FORMATS:
+                self.respond_json(
+                    {"error": f"Неподдерживаемый формат: {export_format}; доступны {', '.join(EXPORT_FORMATS)}"},
+                    status=400,
+                )
+                return
+
+            filters = parse_report_filters(query_params)
+            if parsed.path == "/export/reports":
+                name, fields, rows = "reports", EXPORT_REPORT_FIELDS, db.iter_export_reports(filters)
+            else:
+                name, fields, rows = "hotspots", EXPORT_HOTSPOT_FIELDS, db.iter_export_hotspots(filters)
+            self.respond_export(name, export_format, fields, prefetch(rows))
+            return
+
+        if parsed.path.startswith("/reports/by-hash/"):
+            match = {
+                field: values[0]
+                for field, values in parse_qs(parsed.query).items()
+                if field in HASH_MATCH_FIELDS and values[0]
+            }
+            row = db.get_report_by_hash(Path(parsed.path).name.lower(), match)
+            if row is None:
+                self.respond_json({"error": "Отчёт не найден"}, status=404)
+                return
+            self.respond_json(serialize_report(row, self.server_origin()))
+            return
+
+        if parsed.path == "/events":
+            self.subscribe_events()
+            return
+
+        if parsed.path.startswith("/uploads/"):
+            self.send_upload(Path(parsed.path).name)
+            return
+
+        # Query string is ignored so shared links like /?report=... return index.html
+        asset = get_static_asset(parsed.path)
+        if asset is not None:
+            self.send_static(asset)
+            return
+
+        # Nothing else under BASE_DIR is public: it holds the database and snapshot files
+        self.send_error(404, "Not Found")
+
+    def do_HEAD(self):
+        parsed = urlparse(self.path)
+        if parsed.path.startswith("/uploads/"):
+            self.send_upload(Path(parsed.path).name, head_only=True)
+            return
+
+        asset = get_static_asset(parsed.path)
+        if asset is not None:
+            self.send_static(asset, head_only=True)
+            return
+        self.send_error(404, "Not Found")
 
     def do_DELETE(self):
         parsed = urlparse(self.path)
         if not parsed.path.startswith("/uploads/"):
             self.send_error(404, "Not Found")
             return
+        try:
+            self.delete_upload(Path(parsed.path).name)
+        except DatabaseBusyError:
+            self.reject(503, "База данных перегружена, повторите позже")
 
-        stored_filename = Path(parsed.path).name
-        
+    def delete_upload(self, stored_filename):
         # Get report info before deletion
         report = db.get_report_by_filename(stored_filename)
         if not report:
@@ -657,13 +2031,11 @@ class ReaderHandler(SimpleHTTPRequestHandler):
             self.respond_json({"error": "Не удалось удалить отчёт из базы данных"}, status=500)
             return
 
-        # Delete file from disk
-        target = UPLOAD_DIR / stored_filename
+        # Delete file from blob storage
         try:
-            if target.exists():
-                target.unlink()
+            blobs.delete(stored_filename)
             self.respond_json({"status": "deleted"})
-        except OSError as e:
+        except Exception as e:
             self.respond_json({"error": f"Не удалось удалить файл: {str(e)}"}, status=500)
 
     def server_origin(self):
@@ -671,21 +2043,214 @@ class ReaderHandler(SimpleHTTPRequestHandler):
         scheme = "https" if self.server.server_address[1] == 443 else "http"
         return f"{scheme}://{host}"
 
-    def respond_json(self, payload, status=200):
-        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    def snapshot_headers(self):
+        """X-Snapshot-Age for responses built from the read snapshot"""
+        age = db.snapshot_age()
+        if age is None:
+            return {}
+        return {"X-Snapshot-Age": str(int(age))}
+
+    def read_body(self, content_length, deadline_seconds):
+        """Read exactly content_length bytes of request body within deadline_seconds
+
+        The socket timeout alone only bounds each recv, so a client sending
+        a byte now and then could otherwise hold its ingest slot forever.
+        """
+        deadline = time.monotonic() + deadline_seconds
+        body = bytearray()
+        try:
+            while len(body) < content_length:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("request body deadline exceeded")
+                self.connection.settimeout(min(remaining, self.timeout))
+                data = self.rfile.read1(min(UPLOAD_READ_CHUNK_SIZE, content_length - len(body)))
+                if not data:
+                    raise ConnectionError("client closed the connection mid-body")
+                body += data
+        finally:
+            self.connection.settimeout(self.timeout)
+        return bytes(body)
+
+    def reject(self, status, message, retry_after=RETRY_AFTER_SECONDS):
+        """Refuse a request quickly, without reading its body"""
+        headers = {"Connection": "close"}
+        if retry_after:
+            headers["Retry-After"] = str(retry_after)
+        self.respond_json({"error": message}, status=status, headers=headers)
+
+    def respond_json(self, payload, status=200, headers=None):
+        data = dumps_json(payload)
+        encoding = None
+        if len(data) >= COMPRESS_MIN_SIZE:
+            encoding = negotiate_encoding(self.headers.get("Accept-Encoding"))
+            data = compress(data, encoding)
         self.send_response(status)
         self.send_header("Content-Type", "application/json; charset=utf-8")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Vary", "Accept-Encoding")
         self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
         self.end_headers()
         self.wfile.write(data)
 
+    def send_static(self, asset, head_only=False):
+        """Serve a precompressed frontend file from memory"""
+        encoding, (body, etag) = asset.variant(
+            negotiate_encoding(self.headers.get("Accept-Encoding"))
+        )
+        if_none_match = self.headers.get("If-None-Match", "")
+        not_modified = etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+
+        self.send_response(304 if not_modified else 200)
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Last-Modified", self.date_time_string(asset.last_modified))
+        if not_modified:
+            self.end_headers()
+            return
+        self.send_header("Content-Type", asset.content_type)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(body)
+
+    def subscribe_events(self):
+        """Open a Server-Sent Events stream and hand the socket to the broker"""
+        self.log_request(200)
+        # The head goes out through the broker: the client's "open" then
+        # means it is subscribed, and a list it loads afterwards is in sync
+        head = (
+            f"{self.protocol_version} 200 OK\r\n"
+            f"Server: {self.version_string()}\r\n"
+            f"Date: {self.date_time_string()}\r\n"
+            "Content-Type: text/event-stream; charset=utf-8\r\n"
+            "Cache-Control: no-cache\r\n"
+            "X-Accel-Buffering: no\r\n"
+            # The stream has no length; it ends when either side closes it
+            "Connection: close\r\n"
+            "\r\n"
+            "retry: 3000\n\n"
+        )
+
+        self.close_connection = True
+        self.server.detach(self.connection)
+        events.attach(self.connection, head.encode("latin-1"))
+
+    def send_upload(self, stored_filename, head_only=False):
+        """Serve a stored report, compressing it on the fly when negotiated"""
+        try:
+            f, size = blobs.open(stored_filename)
+        except OSError:
+            self.send_error(404, "File not found")
+            return
+
+        with closing(f):
+            encoding = None
+            if size >= COMPRESS_MIN_SIZE:
+                encoding = negotiate_encoding(self.headers.get("Accept-Encoding"))
+            chunked = bool(encoding) and self.request_version != "HTTP/1.0"
+
+            self.send_response(200)
+            self.send_header("Content-Type", self.guess_type(stored_filename))
+            self.send_header("Vary", "Accept-Encoding")
+            if encoding:
+                self.send_header("Content-Encoding", encoding)
+            if not encoding:
+                self.send_header("Content-Length", str(size))
+            elif chunked:
+                self.send_header("Transfer-Encoding", "chunked")
+            else:
+                self.send_header("Connection", "close")
+                self.close_connection = True
+            self.end_headers()
+            if head_only:
+                return
+
+            writer = ChunkedWriter(self.wfile, chunked=chunked, encoding=encoding)
+            while True:
+                block = f.read(STREAM_CHUNK_SIZE)
+                if not block:
+                    break
+                writer.write(block)
+            writer.close()
+
+    def start_stream(self, content_type, status=200, headers=None):
+        """Send headers for a body of unknown length and return its ChunkedWriter"""
+        chunked = self.request_version != "HTTP/1.0" and self.protocol_version >= "HTTP/1.1"
+        encoding = negotiate_encoding(self.headers.get("Accept-Encoding"))
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        else:
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        return ChunkedWriter(self.wfile, chunked=chunked, encoding=encoding)
+
+    def respond_json_stream(self, prefix, items, suffix, status=200):
+        """Stream a JSON document whose middle part is an array of items
+
+        Each item is serialized on its own and flushed in chunks, so the
+        first rows reach the client before the whole result set is read.
+        suffix may be a callable, evaluated once every item has been sent.
+        """
+        writer = self.start_stream("application/json; charset=utf-8", status=status)
+        writer.write(prefix)
+        separator = b""
+        for item in items:
+            writer.write(separator)
+            writer.write(dumps_json(item))
+            separator = b","
+        writer.write(suffix() if callable(suffix) else suffix)
+        writer.close()
+
+    def respond_export(self, name, export_format, fields, rows):
+        """Stream rows as a CSV or NDJSON attachment
+
+        Rows come from a database cursor batch by batch and leave in
+        chunks, so memory use does not depend on the size of the export.
+        """
+        headers = {"Content-Disposition": f'attachment; filename="{name}.{export_format}"'}
+        headers.update(self.snapshot_headers())
+        writer = self.start_stream(EXPORT_FORMATS[export_format], headers=headers)
+
+        if export_format == "csv":
+            buffer = io.StringIO()
+            csv_writer = csv.writer(buffer)
+            csv_writer.writerow(fields)
+            for row in rows:
+                csv_writer.writerow(row)
+                if buffer.tell() >= STREAM_CHUNK_SIZE:
+                    writer.write(buffer.getvalue().encode("utf-8"))
+                    buffer.seek(0)
+                    buffer.truncate()
+            writer.write(buffer.getvalue().encode("utf-8"))
+        else:
+            for row in rows:
+                writer.write(dumps_json(dict(zip(fields, row))) + b"\n")
+        writer.close()
+
     def log_message(self, format, *args):
         # Log to stdout for container visibility
         super().log_message(format, *args)
 
 
 def run():
-    server = HTTPServer(("0.0.0.0", DEFAULT_PORT), ReaderHandler)
+    server = ReaderServer(("0.0.0.0", DEFAULT_PORT), ReaderHandler)
+    events.start()
+    db.start()
     print(f"Reader server running at http://0.0.0.0:{DEFAULT_PORT}")
     server.serve_forever()
 
@@ -1,18 +1,54 @@
 #!/usr/bin/env python3
 """
-Script to upload sample reports with GitLab CI/CD metadata for testing.
-This simulates what would be sent from a GitLab CI job.
+CI client for uploading Semgrep/SARIF reports with GitLab CI/CD metadata.
+
+Reports are streamed from disk into a gzip-compressed multipart body and
+uploaded concurrently over a pooled session. Uploads are retried with
+backoff on 429/5xx (honouring Retry-After), and files whose SHA-256 the
+server already has are skipped.
+
+Without arguments it uploads the bundled samples with mock GitLab data,
+which is handy for filling a local server with test data:
+
+    python upload_mock_gitlab_data.py
+    python upload_mock_gitlab_data.py --url https://viewer.example.com shards/*.sarif
 """
 
-import json
-import requests
+import argparse
+import gzip
+import hashlib
+import os
+import random
+import sys
+import tempfile
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from datetime import datetime, timedelta
 
-BASE_URL = "http://localhost:8000"
+import requests
+from requests.adapters import HTTPAdapter
+
+BASE_URL = os.environ.get("SEMGREPORT_VIEWER_URL", "http://localhost:8000")
 SAMPLES_DIR = Path(__file__).parent / "samples"
 
+# Bodies up to this size are built in memory, larger ones spill to a temp file
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+READ_CHUNK_SIZE = 1024 * 1024
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_BACKOFF_SECONDS = 60
+
+# Form fields filled from GitLab CI predefined variables for real uploads
+CI_ENV_FIELDS = {
+    "git_tag": "CI_COMMIT_TAG",
+    "git_commit": "CI_COMMIT_SHA",
+    "git_branch": "CI_COMMIT_REF_NAME",
+    "gitlab_pipeline_id": "CI_PIPELINE_ID",
+    "gitlab_job_id": "CI_JOB_ID",
+    "gitlab_project": "CI_PROJECT_NAME",
+    "gitlab_project_url": "CI_PROJECT_URL",
+}
+
 # Mock GitLab CI/CD data - simulating different scenarios
 MOCK_GITLAB_DATA = [
     {
@@ -102,90 +138,194 @@ MOCK_GITLAB_DATA = [
 ]
 
 
-def upload_report_with_metadata(config):
-    """Upload a report file with GitLab metadata"""
-    sample_path = SAMPLES_DIR / config["sample_file"]
-    
-    if not sample_path.exists():
-        print(f"❌ Sample file not found: {sample_path}")
-        return None
-    
-    # Read the sample file
-    with open(sample_path, "rb") as f:
-        file_content = f.read()
-    
-    # Prepare form data
-    files = {
-        "report": (config["filename"], file_content, "application/json")
-    }
-    
-    # Add GitLab metadata as form fields
-    data = {}
-    for key, value in config["git_metadata"].items():
-        if value is not None:
-            # Support both direct names and CI_ prefixed GitLab CI variables
-            data[key] = value
-            # Also add CI_ prefixed versions for compatibility
-            ci_key = key.replace("gitlab_", "CI_").replace("git_", "CI_COMMIT_").upper()
-            if "CI_COMMIT_TAG" in ci_key:
-                data["CI_COMMIT_TAG"] = value
-            elif "CI_COMMIT_SHA" in ci_key:
-                data["CI_COMMIT_SHA"] = value
-            elif "CI_COMMIT_REF_NAME" in ci_key:
-                data["CI_COMMIT_REF_NAME"] = value
-            elif "CI_PIPELINE_ID" in ci_key:
-                data["CI_PIPELINE_ID"] = value
-            elif "CI_JOB_ID" in ci_key:
-                data["CI_JOB_ID"] = value
-            elif "CI_PROJECT_NAME" in ci_key:
-                data["CI_PROJECT_NAME"] = value
-            elif "CI_PROJECT_URL" in ci_key:
-                data["CI_PROJECT_URL"] = value
-    
-    try:
-        response = requests.post(f"{BASE_URL}/upload", files=files, data=data)
-        response.raise_for_status()
-        result = response.json()
-        print(f"✅ Uploaded: {config['filename']}")
-        print(f"   Branch: {config['git_metadata']['git_branch']}")
-        if config['git_metadata']['git_tag']:
-            print(f"   Tag: {config['git_metadata']['git_tag']}")
-        print(f"   Commit: {config['git_metadata']['git_commit'][:8]}...")
-        print(f"   URL: {result.get('url', 'N/A')}")
-        return result
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Failed to upload {config['filename']}: {e}")
-        if hasattr(e, 'response') and e.response is not None:
-            print(f"   Response: {e.response.text}")
-        return None
+def file_sha256(path):
+    """Hash a file in chunks without loading it into memory"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(READ_CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
 
 
-def main():
-    print("🚀 Uploading mock reports with GitLab CI/CD metadata...\n")
-    
-    # Check if server is running
+def build_body(path, filename, fields, compress=True):
+    """Stream a multipart/form-data body for one report into a spooled file
+
+    Returns (body, size, content_type); body is positioned at its start.
+    """
+    boundary = uuid.uuid4().hex
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    out = gzip.GzipFile(fileobj=spool, mode="wb", compresslevel=6) if compress else spool
+
+    for name, value in fields.items():
+        out.write(
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{name}"\r\n\r\n'
+            f"{value}\r\n".encode("utf-8")
+        )
+    safe_filename = filename.replace('"', "%22")
+    out.write(
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="report"; filename="{safe_filename}"\r\n'
+        f"Content-Type: application/json\r\n\r\n".encode("utf-8")
+    )
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(READ_CHUNK_SIZE), b""):
+            out.write(block)
+    out.write(f"\r\n--{boundary}--\r\n".encode("utf-8"))
+
+    if compress:
+        out.close()
+    size = spool.tell()
+    spool.seek(0)
+    return spool, size, f"multipart/form-data; boundary={boundary}"
+
+
+def retry_delay(attempt, response=None):
+    """Delay before the next attempt: Retry-After if given, else jittered exponential backoff"""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(int(retry_after), MAX_BACKOFF_SECONDS)
+    return min(2 ** attempt, MAX_BACKOFF_SECONDS) * random.uniform(0.5, 1.0)
+
+
+# Metadata that tells pipelines apart; the same file from another run is uploaded again
+RUN_IDENTITY_FIELDS = ("gitlab_project", "git_commit", "gitlab_pipeline_id")
+
+
+def server_has_report(session, base_url, sha256, fields):
+    """Whether the server already has this file from the same project, commit and pipeline"""
+    params = {name: fields[name] for name in RUN_IDENTITY_FIELDS if fields.get(name)}
     try:
-        response = requests.get(f"{BASE_URL}/reports", timeout=2)
-        response.raise_for_status()
+        response = session.get(f"{base_url}/reports/by-hash/{sha256}", params=params, timeout=10)
     except requests.exceptions.RequestException:
-        print(f"❌ Server not reachable at {BASE_URL}")
-        print("   Please make sure the server is running: python server.py")
-        return
-    
-    print(f"✅ Server is running at {BASE_URL}\n")
-    
-    # Upload each mock report
-    results = []
-    for i, config in enumerate(MOCK_GITLAB_DATA, 1):
-        print(f"[{i}/{len(MOCK_GITLAB_DATA)}] Processing {config['filename']}...")
-        result = upload_report_with_metadata(config)
-        if result:
-            results.append(result)
-        print()
-    
-    print(f"\n✨ Upload complete! {len(results)}/{len(MOCK_GITLAB_DATA)} reports uploaded successfully.")
-    print(f"\n📊 View reports at: {BASE_URL}")
+        return False
+    return response.status_code == 200
+
+
+def upload_report(session, base_url, task, retries=5, compress=True, skip_existing=True):
+    """Upload one report; returns (status, detail) where status is uploaded/skipped/failed"""
+    path = task["path"]
+    fields = {key: value for key, value in task["git_metadata"].items() if value}
+
+    sha256 = file_sha256(path) if skip_existing else None
+    if skip_existing and server_has_report(session, base_url, sha256, fields):
+        return "skipped", "already on server"
+
+    body, size, content_type = build_body(path, task["filename"], fields, compress)
+    headers = {"Content-Type": content_type, "Content-Length": str(size)}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+
+    with body:
+        for attempt in range(retries + 1):
+            body.seek(0)
+            response = None
+            try:
+                response = session.post(f"{base_url}/upload", data=body, headers=headers, timeout=300)
+                if response.ok:
+                    return "uploaded", response.json().get("url", "N/A")
+                if response.status_code not in RETRY_STATUSES:
+                    return "failed", f"HTTP {response.status_code}: {response.text}"
+                error = f"HTTP {response.status_code}"
+            except requests.exceptions.RequestException as e:
+                error = str(e)
+
+            if attempt < retries:
+                delay = retry_delay(attempt, response)
+                print(f"⏳ {task['filename']}: {error}, retrying in {delay:.1f}s")
+                time.sleep(delay)
+                # A lost connection or gateway error may hide an upload that went through
+                ambiguous = response is None or response.status_code not in (429, 503)
+                if skip_existing and ambiguous and server_has_report(session, base_url, sha256, fields):
+                    return "uploaded", "stored by an earlier attempt"
+
+    return "failed", f"{error} after {retries + 1} attempts"
+
+
+def mock_tasks():
+    """Upload tasks for the bundled samples with mock GitLab metadata"""
+    return [
+        {
+            "path": SAMPLES_DIR / config["sample_file"],
+            "filename": config["filename"],
+            "git_metadata": config["git_metadata"],
+        }
+        for config in MOCK_GITLAB_DATA
+    ]
+
+
+def ci_tasks(paths):
+    """Upload tasks for real report files with metadata from GitLab CI variables"""
+    git_metadata = {field: os.environ.get(var) for field, var in CI_ENV_FIELDS.items()}
+    return [
+        {"path": Path(path), "filename": Path(path).name, "git_metadata": git_metadata}
+        for path in paths
+    ]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Upload Semgrep/SARIF reports to SemgReport Viewer")
+    parser.add_argument("files", nargs="*", help="Report files; without files the bundled samples are uploaded with mock data")
+    parser.add_argument("--url", default=BASE_URL, help="Server URL (default: $SEMGREPORT_VIEWER_URL or %(default)s)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Parallel uploads (default: %(default)s)")
+    parser.add_argument("--retries", type=int, default=5, help="Retries on 429/5xx and network errors (default: %(default)s)")
+    parser.add_argument("--no-gzip", action="store_true", help="Send uncompressed request bodies")
+    parser.add_argument("--no-skip-existing", action="store_true", help="Upload even if the server already has the file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    base_url = args.url.rstrip("/")
+
+    if args.files:
+        tasks = ci_tasks(args.files)
+        skip_existing = not args.no_skip_existing
+    else:
+        print("🚀 Uploading mock reports with GitLab CI/CD metadata...\n")
+        tasks = mock_tasks()
+        # The mock set reuses the same samples under different names
+        skip_existing = False
+
+    missing = [task for task in tasks if not task["path"].is_file()]
+    for task in missing:
+        print(f"❌ File not found: {task['path']}")
+    tasks = [task for task in tasks if task["path"].is_file()]
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=args.concurrency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    counts = {"uploaded": 0, "skipped": 0, "failed": len(missing)}
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        futures = {
+            executor.submit(
+                upload_report, session, base_url, task,
+                retries=args.retries,
+                compress=not args.no_gzip,
+                skip_existing=skip_existing,
+            ): task
+            for task in tasks
+        }
+        for future in as_completed(futures):
+            task = futures[future]
+            try:
+                status, detail = future.result()
+            except Exception as e:
+                status, detail = "failed", str(e)
+            counts[status] += 1
+            icon = {"uploaded": "✅", "skipped": "⏭️ ", "failed": "❌"}[status]
+            print(f"{icon} {task['filename']}: {detail}")
+
+    print(
+        f"\n✨ Done: {counts['uploaded']} uploaded, {counts['skipped']} skipped, "
+        f"{counts['failed']} failed out of {len(tasks) + len(missing)}."
+    )
+    print(f"📊 View reports at: {base_url}")
+    return 1 if counts["failed"] else 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())